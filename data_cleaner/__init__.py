@@ -1,9 +1,10 @@
 # -*- coding: utf-8 -*-
 
-
-from .data_cleaner import DataCleaner
-from .georef_api import GeorefWrapper
-
 __author__ = """Datos Argentina"""
 __email__ = 'datos@modernizacion.gob.ar'
 __version__ = '0.2.1'
+
+from .data_cleaner import DataCleaner
+from .georef_api import GeorefWrapper
+from .georef_cache import GeorefCache
+from .georef_offline import GeorefOffline
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Guarda en disco los resultados de limpiar bloques de filas.
+
+Cada resultado se identifica por un hash del contenido del bloque, de las
+reglas y de la versión del paquete, por lo que al volver a limpiar un archivo
+que cambió poco sólo se limpian los bloques nuevos o modificados. Los bloques
+se definen por posición: agregar o quitar filas desplaza los límites de todos
+los bloques siguientes, que se vuelven a limpiar.
+
+Los resultados que no se usan hace más de `max_age` segundos se eliminan, y
+si el cache supera `max_size` bytes se eliminan los usados hace más tiempo.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import time
+
+import pandas as pd
+
+# segundos que se conserva cada resultado sin usarse
+MAX_AGE = 30 * 24 * 60 * 60
+# tamaño máximo del cache en bytes
+MAX_SIZE = 1024 ** 3
+
+def hash_dataframe(df):
+    """Calcula un hash del contenido de un DataFrame.
+
+    El hash depende de los nombres de los campos y de los valores de cada
+    fila en orden, pero no del índice.
+
+    Args:
+        df (pandas.DataFrame): Bloque de filas.
+
+    Returns:
+        str: Hash hexadecimal.
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([str(field) for field in df.columns]).encode(
+        "utf-8"))
+    digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+def hash_object(obj):
+    """Calcula un hash de un objeto serializable a JSON (ej.: reglas).
+
+    El hash depende del orden de las claves de los diccionarios, porque
+    algunas reglas (ej.: reemplazar_string) aplican sus reemplazos en orden.
+
+    Args:
+        obj: Listas, diccionarios y valores simples.
+
+    Returns:
+        str: Hash hexadecimal.
+    """
+    serialized = json.dumps(obj, default=repr)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+class BlockCache(object):
+    """Cache en disco de objetos indexados por hashes."""
+
+    def __init__(self, cache_dir, max_size=MAX_SIZE, max_age=MAX_AGE):
+        """Crea el directorio del cache si no existe.
+
+        Args:
+            cache_dir (str): Directorio donde se guardan los resultados.
+            max_size (int): Tamaño máximo del cache en bytes.
+            max_age (float): Segundos que se conserva cada resultado sin
+                usarse.
+        """
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(*parts):
+        """Combina varias partes (hashes, versiones, etc.) en una clave."""
+        return hashlib.sha256(
+            "\0".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + ".pkl")
+
+    def get(self, key):
+        """Devuelve el objeto guardado con una clave, o None si no existe.
+
+        Los archivos ilegibles (ej.: escritos a medias) se ignoran.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as cache_file:
+                value = pickle.load(cache_file)
+        except (IOError, OSError, EOFError, pickle.UnpicklingError):
+            self.misses += 1
+            return None
+
+        # la fecha de modificación registra el último uso, para `prune`
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return value
+
+    def set(self, key, value):
+        """Guarda un objeto con una clave.
+
+        El archivo se escribe completo con otro nombre y después se renombra,
+        para que otro proceso nunca lea un resultado a medias.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as cache_file:
+                pickle.dump(value, cache_file, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
+    def prune(self):
+        """Elimina los resultados vencidos y los que exceden el tamaño total.
+
+        Se conservan los resultados usados más recientemente, hasta sumar
+        `max_size` bytes.
+        """
+        now = time.time()
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".pkl"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total_size = 0
+        for (used, size, path) in sorted(entries, reverse=True):
+            if now - used <= self.max_age and \
+                    total_size + size <= self.max_size:
+                total_size += size
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -5,8 +5,14 @@
 
 import string
 import pandas as pd
-from functools import partial
+from functools import lru_cache
 
+from .distinct_values import map_distinct
+
+PUNCTUATION = frozenset(string.punctuation)
+
+# cantidad máxima de valores capitalizados que se mantienen en cache
+CAPITALIZE_CACHE_SIZE = 2 ** 16
 
 LOWER_WORDS = [
     "el", "los", "la", "las",
@@ -31,9 +37,10 @@ def normalize_word(word, lower_words=None):
     """
     lower_words = lower_words or LOWER_WORDS
 
-    for character in string.punctuation:
-        if character in word:
-            return capitalize(word, sep=character)
+    punctuation = PUNCTUATION.intersection(word)
+    if punctuation:
+        character = min(punctuation, key=string.punctuation.index)
+        return capitalize(word, sep=character)
     if word.lower() in IGNORE_WORDS:
         return word
     if word.lower() in lower_words:
@@ -61,8 +68,40 @@ def capitalize(string, sep=None, encoding="utf-8", lower_words=None):
     if len(words) == 0:
         return ""
     first_word = words[0].title()
-    partial_normalize_word = partial(normalize_word, lower_words=lower_words)
-    normalized_words = [first_word] + \
-        list(map(partial_normalize_word, words[1:]))
+    normalized_words = [first_word] + [
+        normalize_word(word, lower_words=lower_words) for word in words[1:]]
 
     return (sep if sep else " ").join(normalized_words)
+
+
+@lru_cache(maxsize=CAPITALIZE_CACHE_SIZE)
+def _cached_capitalize(string, lower_words):
+    return capitalize(string, lower_words=lower_words)
+
+
+def capitalize_series(series, lower_words=None):
+    """Capitaliza una serie de strings, una sola vez por valor distinto.
+
+    Los resultados se guardan en un cache LRU acotado y compartido entre
+    llamadas, por lo que las columnas con muchos valores repetidos sólo
+    capitalizan cada valor distinto una vez.
+
+    Args:
+        series (pandas.Series): Strings a capitalizar.
+        lower_words (list): Palabras que se mantienen en minúsculas.
+
+    Returns:
+        pandas.Series: Serie de strings normalizados.
+    """
+    lower_words = tuple(lower_words) if lower_words is not None else None
+    return map_distinct(
+        series, lambda value: _cached_capitalize(value, lower_words))
+
+
+def capitalize_cache_info():
+    """Devuelve las estadísticas del cache de `capitalize_series`.
+
+    Returns:
+        CacheInfo: Con los campos hits, misses, maxsize y currsize.
+    """
+    return _cached_capitalize.cache_info()
@@ -7,28 +7,55 @@ La clase DataCleaner permite limpiar archivos CSVs con datos a partir de la
 aplicación de reglas de limpieza.
 """
 
+import numpy as np
 import pandas as pd
 import geopandas as gpd
 import pycrs
-from dateutil import tz
-import arrow
 import parsley
 from unidecode import unidecode
 import unicodecsv
 import cchardet
 import warnings
+import logging
 import inspect
 import re
+import json
 import os
 import subprocess
-from functools import partial
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from collections import namedtuple, OrderedDict
 
+from .fingerprint_keyer import fingerprint_keyer_series
 from .fingerprint_keyer import group_fingerprint_strings
-from .fingerprint_keyer import get_best_replacements, replace_by_key
-from .capitalizer import capitalize
+from .fingerprint_keyer import update_fingerprint_groups
+from .fingerprint_keyer import merge_fingerprint_groups
+from .fingerprint_keyer import get_best_replacements, replace_by_key_series
+from .capitalizer import capitalize_series
+from .string_replacer import replace_substrings
+from .distinct_values import transform_distinct
+from .date_parser import parse_datetime_series
+from .date_parser import parse_date_series
+from .block_cache import BlockCache, hash_dataframe, hash_object
+from . import __version__
 
 from .georef_api import *
 
+logger = logging.getLogger(__name__)
+
+# paso de un plan de limpieza: acción ("aplicar", "fusionar" u "omitir"),
+# campo que modifican las reglas fusionables y lista de (regla, argumentos)
+PlanStep = namedtuple("PlanStep", ["action", "field", "rules"])
+
+# cantidad máxima de expresiones regulares y PEGs compiladas en cache
+REGEX_CACHE_SIZE = 256
+GRAMMAR_CACHE_SIZE = 64
+# cantidad máxima de valores parseados con PEGs en cache
+PEG_CACHE_SIZE = 2**16
+# tipos inferidos por pandas de las columnas object que pueden tener strings
+TEXT_INFERRED_TYPES = ["string", "mixed", "mixed-integer"]
+
 
 class DuplicatedField(ValueError):
     """Salta cuando hay un campo duplicado en el dataset."""
@@ -51,21 +78,69 @@ class DataCleaner(object):
     INPUT_DEFAULT_SEPARATOR = str(",")
     INPUT_DEFAULT_QUOTECHAR = str('"')
     DEFAULT_SUFIX = "normalizado"
-
-    def __init__(self, input_path, ignore_dups=False, **kwargs):
+    # bytes del archivo de entrada que se analizan para detectar su encoding
+    ENCODING_SAMPLE_SIZE = 1024 * 1024
+    ENCODING_BLOCK_SIZE = 64 * 1024
+    # filas por bloque al limpiar con cache un archivo cargado en memoria
+    CACHE_BLOCK_SIZE = 100000
+
+    # reglas que operan fila a fila y pueden aplicarse a un CSV por bloques
+    ROW_LOCAL_RULES = [
+        "remover_columnas", "renombrar_columnas", "nombre_propio",
+        "mail_format", "reemplazar", "reemplazar_string", "fecha_completa",
+        "fecha_simple", "fecha_separada", "string_simple_split",
+        "string_regex_split", "string_peg_split", "string_regex_substitute"
+    ]
+    # reglas que necesitan la columna completa, pero que pueden aplicarse
+    # por bloques haciendo pasadas previas sobre el CSV
+    MULTI_PASS_RULES = ["string"]
+    # reglas que transforman cada valor de un campo independientemente del
+    # resto de las filas, salvo string que usa sus frecuencias
+    FUSABLE_RULES = [
+        "nombre_propio", "mail_format", "reemplazar", "reemplazar_string",
+        "string_regex_substitute", "string"
+    ]
+    # reglas cuyos campos nuevos no dependen de los datos
+    DEAD_CODE_RULES = FUSABLE_RULES + [
+        "fecha_completa", "fecha_simple", "fecha_separada"
+    ]
+
+    def __init__(self, input_path, ignore_dups=False, chunksize=None,
+                 encoding_sample_size=None, n_jobs=None, georef=None,
+                 **kwargs):
         """Carga datos a limpiar en un DataFrame, normalizando sus columnas.
 
         Args:
             input_path (str): Ruta al archivo que se va a limpiar.
             ignore_dups (bool): Ignora los duplicados en colunas
+            chunksize (int): Cantidad de filas por bloque. Si se especifica,
+                el CSV no se carga completo en memoria: sólo se lee su
+                encabezado y `clean_file` lo limpia bloque a bloque.
+            encoding_sample_size (int): Cantidad máxima de bytes del archivo
+                que se analizan para detectar su encoding.
+            n_jobs (int): Cantidad de procesos entre los que `clean` reparte
+                las filas para aplicar las reglas.
+            georef (GeorefWrapper): Cliente de la API de Georef. Por defecto
+                se crea uno con la configuración por defecto.
             kwargs: Todos los argumentos que puede tomar `pandas.read_csv`
         """
         default_args = {
-            'encoding': self._get_file_encoding(input_path),
             'sep': self.INPUT_DEFAULT_SEPARATOR,
             'quotechar': self.INPUT_DEFAULT_QUOTECHAR
         }
         default_args.update(kwargs)
+        if 'encoding' not in default_args:
+            default_args['encoding'] = self._get_file_encoding(
+                input_path, encoding_sample_size)
+
+        if chunksize and not input_path.endswith('.csv'):
+            raise Exception(
+                "La lectura por bloques sólo está soportada para CSVs.")
+        self.input_path = input_path
+        self.chunksize = chunksize
+        self.n_jobs = n_jobs
+        self.georef = georef or GeorefWrapper()
+        self.read_args = default_args
 
         # chequea que no haya fields con nombre duplicado
         if not ignore_dups and input_path.endswith('.csv'):
@@ -91,8 +166,10 @@ class DataCleaner(object):
 
         # lee el CSV a limpiar
         elif input_path.endswith('.csv'):
+            # en modo por bloques sólo lee el encabezado
             self.df = pd.read_csv(
-                input_path, dtype=str, **default_args)
+                input_path, dtype=str, nrows=0 if chunksize else None,
+                **default_args)
 
         # lee el XLSX a limpiar
         elif input_path.endswith('.xlsx'):
@@ -105,14 +182,17 @@ class DataCleaner(object):
 
         # limpieza automática
         # normaliza los nombres de los campos
+        self._init_field_names("__init__")
         self.df.columns = self._normalize_fields(self.df.columns)
+        self._current_rule = None
 
         # remueve todos los saltos de línea
-        if len(self.df) > 0:
-            self.df = self.df.applymap(self._remove_line_breaks)
+        self.df = self._remove_all_line_breaks(self.df)
 
-        # guarda PEGs compiladas para optimizar performance
-        self.grammars = {}
+        # estadísticas de las reglas aplicadas {regla: {campo: {clave: n}}}
+        self.stats = {}
+        # valores distintos procesados {(regla, campo): set}
+        self._distinct_values = {}
 
     def _assert_no_duplicates(self, input_path, encoding, sep, quotechar):
 
@@ -132,30 +212,90 @@ class DataCleaner(object):
         elif input_path.endswith('.xlsx'):
             pass
 
-    def _get_file_encoding(self, file_path):
+    def _get_file_encoding(self, file_path, sample_size=None):
         """Detecta la codificación de un archivo con cierto nivel de confianza
            y devuelve esta codificación o el valor por defecto.
 
+        Para no leer completos los archivos grandes, analiza como máximo
+        `sample_size` bytes repartidos entre el principio, el medio y el final
+        del archivo, y deja de leer apenas el detector está seguro.
+
         Args:
             file_path (str): Ruta del archivo.
+            sample_size (int): Cantidad máxima de bytes a analizar.
 
         Returns:
             str: Codificación del archivo.
         """
+        sample_size = sample_size or self.ENCODING_SAMPLE_SIZE
+        file_size = os.path.getsize(file_path)
+
+        detector = cchardet.UniversalDetector()
         with open(file_path, 'rb') as f:
-            info = cchardet.detect(f.read())
-        return (info['encoding'] if info['confidence'] > 0.75
+            for block in self._iter_sample_blocks(f, file_size, sample_size):
+                detector.feed(block)
+                if detector.done:
+                    break
+        detector.close()
+        info = detector.result
+
+        # una muestra ASCII no garantiza que el resto del archivo lo sea
+        if info['encoding'] == 'ASCII' and file_size > sample_size:
+            return self.INPUT_DEFAULT_ENCODING
+
+        return (info['encoding'] if (info['confidence'] or 0) > 0.75
                 else self.INPUT_DEFAULT_ENCODING)
 
+    def _iter_sample_blocks(self, f, file_size, sample_size):
+        """Lee bloques de un archivo para detectar su encoding.
+
+        Si el archivo es más grande que la muestra, reparte la muestra entre
+        el principio, el medio y el final del archivo. Las secciones empiezan
+        y terminan en saltos de línea, para no cortar caracteres de más de un
+        byte.
+
+        Args:
+            f (file): Archivo abierto en modo binario.
+            file_size (int): Tamaño del archivo en bytes.
+            sample_size (int): Cantidad máxima de bytes a leer.
+        """
+        if file_size <= sample_size:
+            sections = [(0, file_size)]
+        else:
+            section_size = sample_size // 3
+            sections = [(0, section_size),
+                        ((file_size - section_size) // 2, section_size),
+                        (file_size - section_size, section_size)]
+
+        for start, size in sections:
+            f.seek(start)
+            if start > 0:
+                # descarta el resto de la línea en la que cae la sección
+                f.readline(self.ENCODING_BLOCK_SIZE)
+            block = b""
+            while size > 0:
+                block = f.read(min(size, self.ENCODING_BLOCK_SIZE))
+                if not block:
+                    break
+                size -= len(block)
+                yield block
+            # completa la última línea de la sección
+            if block and not block.endswith(b"\n"):
+                yield f.readline(self.ENCODING_BLOCK_SIZE)
+
     def _normalize_fields(self, fields):
         return [self._normalize_field(field) for field in fields]
 
-    def _normalize_field(self, field, sep="_"):
+    def _normalize_field(self, field, sep="_", warn=True):
         """Normaliza un string para ser nombre de campo o sufijo de dataset.
 
+        Los nombres normalizados se guardan por objeto, y el warning por un
+        nombre que no sigue las convenciones se emite una sola vez.
+
         Args:
             field (str): Nombre original del campo o sufijo de datset.
             sep (str): Separador para el nombre normalizado.
+            warn (bool): Emite un warning si el nombre cambió.
 
         Returns:
             str: Nombre de campo o sufijo de datset normalizado.
@@ -163,22 +303,15 @@ class DataCleaner(object):
         if not isinstance(field, str):
             field = str(field)
 
-        # reemplaza caracteres que no sean unicode
-        norm_field = unidecode(field).strip()
-
-        norm_field = norm_field.replace(" ", sep)
-        norm_field = norm_field.replace("-", sep).replace("_", sep)
-        norm_field = norm_field.replace("/", sep)
-        norm_field = self._camel_convert(norm_field).lower()
-
-        # remueve caracteres que no sean alfanuméricos o "_"
-        norm_field = ''.join(char for char in norm_field
-                             if char.isalnum() or char == "_")
+        key = (field, sep)
+        norm_field = self._normalized_fields.get(key)
+        if norm_field is None:
+            norm_field = self._normalized_fields[key] = \
+                self._normalize_name(field, sep)
 
         # emite un Warning si tuvo que normalizar el field
-        if field != norm_field:
-            caller_rule = self._get_normalize_field_caller(
-                inspect.currentframe())
+        if warn and field != norm_field and key not in self._warned_fields:
+            self._warned_fields.add(key)
             msg = """
 
 El campo "{}" no sigue las convenciones para escribir
@@ -188,57 +321,1022 @@ normaliza automáticamente los campos en estos casos, lo
 que puede llevar a resultados inesperados.
 
 El nuevo nombre del campo normalizado es: "{}".
-Método que llamó al normalizador de campos: {}
-""".format(field, sep, norm_field, caller_rule)
+""".format(field, sep, norm_field)
+            if self._current_rule:
+                msg += "Método que llamó al normalizador de campos: " \
+                    "{}\n".format(self._current_rule)
             warnings.warn(msg)
 
         return norm_field
 
+    @classmethod
+    def _normalize_name(cls, field, sep):
+        # reemplaza caracteres que no sean unicode
+        norm_field = unidecode(field).strip()
+
+        norm_field = norm_field.replace(" ", sep)
+        norm_field = norm_field.replace("-", sep).replace("_", sep)
+        norm_field = norm_field.replace("/", sep)
+        norm_field = cls._camel_convert(norm_field).lower()
+
+        # remueve caracteres que no sean alfanuméricos o "_"
+        return ''.join(char for char in norm_field
+                       if char.isalnum() or char == "_")
+
     @staticmethod
     def _camel_convert(name):
         return re.sub('([a-z0-9])([A-Z])', r'\1_\2', name)
 
     @staticmethod
-    def _get_normalize_field_caller(curframe):
-        curframe = inspect.currentframe()
-        calframe = inspect.getouterframes(curframe, 2)
+    def _remove_all_line_breaks(df, replace_char=" "):
+        """Reemplaza los saltos de línea de los campos de texto.
 
-        if calframe[2][3] != "_normalize_fields":
-            caller_rule = calframe[2][3]
-        else:
-            caller_rule = calframe[3][3]
+        Sólo se recorren las columnas de tipo object que pueden tener strings,
+        y sólo se reescriben los valores que tienen algún salto de línea.
 
-        return caller_rule
+        Args:
+            df (pandas.DataFrame): DataFrame recién leído, que se modifica.
 
-    @staticmethod
-    def _remove_line_breaks(value, replace_char=" "):
-        if isinstance(value, str):
-            return str(value).replace('\n', replace_char)
-        else:
-            return value
+        Returns:
+            pandas.DataFrame: El mismo DataFrame, sin saltos de línea.
+        """
+        for field in df.select_dtypes(include=["object"]).columns:
+            series = df[field]
+            # .str falla en columnas sin strings (ej.: fechas o bytes)
+            inferred_type = pd.api.types.infer_dtype(series, skipna=True)
+            if inferred_type not in TEXT_INFERRED_TYPES:
+                continue
+            has_line_breaks = series.str.contains("\n", regex=False,
+                                                  na=False)
+            if has_line_breaks.any():
+                df.loc[has_line_breaks, field] = series[
+                    has_line_breaks].str.replace("\n", replace_char,
+                                                 regex=False)
+        return df
+
+    def _iter_chunks(self, header_df):
+        """Lee el CSV de entrada de a bloques de `chunksize` filas.
+
+        Cada bloque recibe la misma limpieza automática que un CSV leído
+        completo. Si el CSV no tiene filas, devuelve sólo el encabezado. Si
+        el DataCleaner no se creó con `chunksize`, recorre los datos en
+        memoria de a bloques de `CACHE_BLOCK_SIZE` filas.
+
+        Args:
+            header_df (pandas.DataFrame): DataFrame vacío con los campos
+                normalizados del CSV, o todos los datos si ya se cargaron.
+        """
+        if not self.chunksize:
+            for start in range(0, len(header_df) or 1, self.CACHE_BLOCK_SIZE):
+                yield header_df.iloc[start:start +
+                                     self.CACHE_BLOCK_SIZE].copy()
+            return
+
+        fields = header_df.columns
+        reader = pd.read_csv(self.input_path, dtype=str,
+                             chunksize=self.chunksize, **self.read_args)
+
+        empty = True
+        for chunk in reader:
+            empty = False
+            chunk.columns = fields
+            yield self._remove_all_line_breaks(chunk)
+
+        if empty:
+            yield header_df.copy()
+
+    @classmethod
+    def _from_dataframe(cls, df):
+        """Crea un DataCleaner sobre un DataFrame ya cargado y normalizado.
+
+        Args:
+            df (pandas.DataFrame): Datos a limpiar.
+
+        Returns:
+            DataCleaner: Objeto que opera sobre `df`.
+        """
+        dc = cls.__new__(cls)
+        dc.input_path = None
+        dc.chunksize = None
+        dc.n_jobs = None
+        dc.georef = GeorefWrapper()
+        dc.read_args = {}
+        dc.df = df
+        dc.stats = {}
+        dc._distinct_values = {}
+        dc._init_field_names()
+        return dc
+
+    def _init_field_names(self, current_rule=None):
+        """Inicializa el cache de nombres de campos normalizados."""
+        # {(nombre original, separador): nombre normalizado}
+        self._normalized_fields = {}
+        self._warned_fields = set()
+        # regla que se está aplicando, para los warnings del normalizador
+        self._current_rule = current_rule
+
+    def _apply_rule(self, rule, kwargs):
+        """Aplica una regla in place, registrándola como la regla en curso.
+
+        Args:
+            rule (str): Nombre de la regla.
+            kwargs (dict): Argumentos de la regla.
+        """
+        previous_rule, self._current_rule = self._current_rule, rule
+        try:
+            return getattr(self, rule)(**dict(kwargs, inplace=True))
+        finally:
+            self._current_rule = previous_rule
 
     # Métodos GLOBALES
-    def clean(self, rules):
+    def clean(self, rules, max_workers=None):
         """Aplica las reglas de limpieza al objeto en memoria.
 
+        Si se especifica `max_workers`, las reglas que operan sobre campos
+        disjuntos se aplican en paralelo en un pool de procesos. Si no, y el
+        DataCleaner se creó con `n_jobs`, las filas se reparten entre
+        `n_jobs` procesos. En ambos casos el resultado es idéntico al de
+        aplicar las reglas en orden.
+
+        Args:
+            rules (list): Lista de reglas de limpieza.
+            max_workers (int): Cantidad máxima de procesos a utilizar.
+        """
+        self._assert_not_chunked("clean")
+        if not max_workers and self.n_jobs and self.n_jobs > 1:
+            self._clean_by_partitions(rules)
+            return
+
+        if not max_workers:
+            for step in self._compile_plan(rules):
+                if step.action == "fusionar":
+                    self._apply_fused_rules(step.field, step.rules)
+                elif step.action == "aplicar":
+                    self._apply_rule(*step.rules[0])
+            return
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for segment in self._plan_segments(rules):
+                if isinstance(segment, tuple):
+                    self._apply_rule(*segment)
+                else:
+                    self._clean_components(segment, executor)
+
+    def explain(self, rules):
+        """Describe el plan con el que `clean` aplicaría las reglas.
+
+        Args:
+            rules (list): Lista de reglas de limpieza.
+
+        Returns:
+            str: Un paso del plan por línea.
+        """
+        lines = []
+        for (number, step) in enumerate(self._compile_plan(rules), 1):
+            names = " -> ".join(rule for (rule, kwargs) in step.rules)
+            if step.action == "fusionar":
+                lines.append('{}. fusionar sobre "{}": {}'.format(
+                    number, step.field, names))
+                continue
+
+            rule, kwargs = step.rules[0]
+            rule_fields = self._rule_fields(rule, kwargs)
+            fields = ", ".join('"{}"'.format(field)
+                               for field in sorted(rule_fields[0])) \
+                if rule_fields else "todos los campos"
+            line = "{}. {} {} sobre {}".format(number, step.action, names,
+                                               fields)
+            if step.action == "omitir":
+                line += " (sus resultados no se usan)"
+            lines.append(line)
+
+        return "\n".join(lines)
+
+    def _compile_plan(self, rules):
+        """Compila una lista de reglas en un plan de ejecución.
+
+        Las reglas consecutivas de `FUSABLE_RULES` que modifican el mismo
+        campo se fusionan en un solo paso, que recorre una sola vez los
+        valores distintos del campo. Las reglas que sólo crean campos que
+        luego se remueven sin que ninguna otra regla los lea se omiten, junto
+        con las reglas que los remueven.
+
         Args:
             rules (list): Lista de reglas de limpieza.
+
+        Returns:
+            list: Pasos `PlanStep` en orden de ejecución.
+        """
+        items = list(self._iter_rules(rules))
+        fields = [self._rule_fields(rule, kwargs) for (rule, kwargs) in items]
+        fused_fields = [self._fusable_field(rule, kwargs)
+                        for (rule, kwargs) in items]
+        dead = self._find_dead_rules(items, fields)
+
+        steps = []
+        for (position, (rule, kwargs)) in enumerate(items):
+            field = fused_fields[position]
+            if position in dead:
+                steps.append(PlanStep("omitir", None, [(rule, kwargs)]))
+            elif field and steps and steps[-1].field == field:
+                steps[-1] = PlanStep("fusionar", field,
+                                     steps[-1].rules + [(rule, kwargs)])
+            else:
+                steps.append(PlanStep("aplicar", field, [(rule, kwargs)]))
+        return steps
+
+    def _fusable_field(self, rule, kwargs):
+        """Devuelve el campo que modifica una regla fusionable, o None."""
+        if rule not in self.FUSABLE_RULES:
+            return None
+        args = self._rule_args(rule, kwargs)
+        if args["keep_original"]:
+            return None
+        return self._normalize_field(args["field"], warn=False)
+
+    def _find_dead_rules(self, items, fields):
+        """Busca reglas cuyos campos nuevos se remueven sin usarse.
+
+        Args:
+            items (list): Reglas (nombre, argumentos) en orden.
+            fields (list): Resultado de `_rule_fields` para cada regla.
+
+        Returns:
+            set: Posiciones de las reglas que pueden omitirse, incluyendo las
+                de `remover_columnas` que remueven sus campos.
+        """
+        columns = set(self.df.columns)
+        dead = set()
+        for (position, (rule, kwargs)) in enumerate(items):
+            if fields[position] is None:
+                continue
+            inputs, outputs = fields[position]
+
+            if rule in self.DEAD_CODE_RULES and not outputs & columns and \
+                    not outputs & inputs:
+                removers = self._find_removers(items, fields, position,
+                                               outputs, dead)
+                if removers:
+                    dead |= removers | {position}
+
+            if rule == "remover_columnas":
+                columns -= inputs
+            elif rule == "renombrar_columnas":
+                columns = (columns - inputs) | (outputs - inputs) \
+                    if inputs & columns else columns
+            else:
+                columns |= outputs
+        return dead
+
+    @staticmethod
+    def _find_removers(items, fields, position, outputs, dead):
+        """Busca las reglas que remueven los campos creados por otra regla.
+
+        Returns:
+            set: Posiciones de las reglas `remover_columnas` que remueven
+                todos los campos, o None si alguno se lee antes de removerse.
+        """
+        pending = set(outputs)
+        removers = set()
+        for later in range(position + 1, len(items)):
+            if fields[later] is None:
+                return None
+            inputs, later_outputs = fields[later]
+
+            if items[later][0] == "remover_columnas" and \
+                    later not in dead and inputs & pending:
+                pending -= inputs
+                removers.add(later)
+                if not pending:
+                    return removers
+            elif (inputs | later_outputs) & pending:
+                return None
+        return None
+
+    def _apply_fused_rules(self, field, rules):
+        """Aplica reglas fusionadas sobre los valores distintos de un campo.
+
+        Args:
+            field (str): Campo normalizado que modifican todas las reglas.
+            rules (list): Reglas (nombre, argumentos) en orden.
+        """
+        def transform(values, weights):
+            for (rule, kwargs) in rules:
+                args = self._rule_args(rule, kwargs)
+                # emite los mismos warnings que la regla
+                previous_rule, self._current_rule = self._current_rule, rule
+                try:
+                    self._normalize_field(args["field"])
+                finally:
+                    self._current_rule = previous_rule
+                values = self._transform_values(rule, field, values, weights,
+                                                args)
+            return values
+
+        self.df[field] = transform_distinct(self.df[field], transform,
+                                            with_weights=True)
+
+    def _transform_values(self, rule, field, values, weights, args):
+        """Aplica una regla fusionable sobre valores distintos de un campo.
+
+        Args:
+            rule (str): Nombre de la regla.
+            field (str): Campo normalizado.
+            values (pandas.Series): Valores distintos del campo.
+            weights (numpy.ndarray): Cantidad de filas de cada valor.
+            args (dict): Argumentos de la regla.
+
+        Returns:
+            pandas.Series: Valores transformados, en el mismo orden.
+        """
+        if rule == "nombre_propio":
+            return capitalize_series(values, lower_words=args["lower_words"])
+
+        elif rule == "mail_format":
+            return self._format_mails(values)
+
+        elif rule == "reemplazar":
+            values, counts = self._replace_values(
+                values, args["replacements"], weights)
+            self._update_stats("reemplazar", field, counts)
+            return values
+
+        elif rule == "reemplazar_string":
+            return replace_substrings(values, args["replacements"])
+
+        elif rule == "string_regex_substitute":
+            return values.str.replace(args["regex_str_match"],
+                                      args["regex_str_sub"])
+
+        elif rule == "string":
+            keys = fingerprint_keyer_series(
+                values, sort_tokens=args["sort_tokens"],
+                remove_duplicates=args["remove_duplicates"])
+            clusters, counts = group_fingerprint_strings(
+                values, keys=keys, weights=weights)
+            replacements = get_best_replacements(clusters, counts)
+            return replace_by_key_series(replacements, values,
+                                         keys=keys).str.strip()
+
+        raise ValueError("La regla '{}' no es fusionable.".format(rule))
+
+    def _plan_segments(self, rules):
+        """Agrupa las reglas en conjuntos independientes entre sí.
+
+        Las reglas que operan sobre todo el DataFrame funcionan como barreras.
+        Entre dos barreras, las reglas se agrupan en componentes conectados
+        por los campos que leen o escriben: dos componentes distintos nunca
+        comparten campos, por lo que pueden aplicarse en paralelo.
+
+        Yields:
+            tuple o list: Una regla global (nombre, argumentos), o una lista
+                de componentes, cada uno una lista de (posición, nombre,
+                argumentos, campos) en orden de aplicación.
+        """
+        segment = []
+        for position, (rule, kwargs) in enumerate(self._iter_rules(rules)):
+            rule_fields = self._rule_fields(rule, kwargs)
+
+            if rule_fields is None:
+                if segment:
+                    yield self._group_components(segment)
+                    segment = []
+                yield rule, kwargs
+            else:
+                segment.append((position, rule, kwargs,
+                                rule_fields[0] | rule_fields[1]))
+
+        if segment:
+            yield self._group_components(segment)
+
+    @staticmethod
+    def _group_components(segment):
+        """Agrupa reglas que comparten algún campo (union-find).
+
+        Args:
+            segment (list): Lista de (posición, nombre, argumentos, campos).
+
+        Returns:
+            list: Componentes, cada uno una lista de reglas en orden.
+        """
+        parents = {}
+
+        def find(field):
+            while parents.setdefault(field, field) != field:
+                parents[field] = parents[parents[field]]
+                field = parents[field]
+            return field
+
+        for (position, rule, kwargs, fields) in segment:
+            fields = sorted(fields)
+            for field in fields[1:]:
+                parents[find(field)] = find(fields[0])
+
+        components = {}
+        for item in segment:
+            components.setdefault(find(min(item[3])), []).append(item)
+        return list(components.values())
+
+    def _clean_components(self, components, executor):
+        """Aplica en paralelo componentes de reglas independientes.
+
+        Cada proceso recibe sólo los campos que usa su componente. Luego se
+        reproducen en orden de aplicación los cambios de columnas de cada
+        regla, para que el DataFrame resultante tenga las mismas columnas y
+        en el mismo orden que con una aplicación secuencial.
+
+        Args:
+            components (list): Componentes de `_group_components`.
+            executor (concurrent.futures.Executor): Pool de procesos.
+        """
+        jobs = []
+        for component in components:
+            fields = set.union(*[item[3] for item in component])
+            df = self.df[[field for field in self.df.columns
+                          if field in fields]].copy()
+            jobs.append((df, [(rule, kwargs)
+                              for (position, rule, kwargs, _) in component]))
+
+        if len(jobs) > 1:
+            futures = [executor.submit(self._clean_columns, *job)
+                       for job in jobs]
+            results = [future.result() for future in futures]
+        else:
+            results = [self._clean_columns(*jobs[0])]
+
+        # reproduce los cambios de columnas en el orden de las reglas
+        columns = list(self.df.columns)
+        snapshots = []
+        for (component, (df, component_snapshots, stats, caught)) in zip(
+                components, results):
+            for (rule_index, item) in enumerate(component):
+                snapshots.append((item[0], item[1],
+                                  component_snapshots[rule_index],
+                                  component_snapshots[rule_index + 1]))
+            self._merge_stats(*stats)
+        self._rewarn([caught for (_, _, _, caught) in results])
+
+        for (position, rule, before, after) in sorted(snapshots):
+            self._replay_columns(columns, rule, before, after)
+
+        cleaned_df = self.df.drop(
+            columns=[field for field in self.df.columns
+                     if field not in columns])
+        for (df, _, _, _) in results:
+            for field in df.columns:
+                cleaned_df[field] = df[field].values
+        self.df = cleaned_df[columns]
+
+    @staticmethod
+    def _clean_columns(df, rules):
+        """Aplica reglas en orden sobre los campos de un componente.
+
+        Returns:
+            tuple: (DataFrame limpio, columnas antes y después de cada regla,
+                estadísticas, warnings emitidos)
+        """
+        dc = DataCleaner._from_dataframe(df)
+        snapshots = [list(dc.df.columns)]
+        with warnings.catch_warnings(record=True) as caught:
+            for (rule, kwargs) in rules:
+                dc._apply_rule(rule, kwargs)
+                snapshots.append(list(dc.df.columns))
+        return dc.df, snapshots, (dc.stats, dc._distinct_values), caught
+
+    @staticmethod
+    def _rewarn(caught_lists):
+        """Emite en este proceso los warnings capturados en otros procesos.
+
+        Args:
+            caught_lists (list): Listas de `warnings.WarningMessage`. Los
+                warnings repetidos se emiten una sola vez.
+        """
+        emitted = set()
+        for caught in caught_lists:
+            for warning in caught:
+                key = (str(warning.message), warning.category,
+                       warning.filename, warning.lineno)
+                if key not in emitted:
+                    emitted.add(key)
+                    warnings.warn_explicit(warning.message, warning.category,
+                                           warning.filename, warning.lineno)
+
+    def _clean_by_partitions(self, rules):
+        """Aplica las reglas repartiendo las filas entre `n_jobs` procesos.
+
+        Las reglas fila a fila se aplican a cada partición por separado y las
+        particiones se vuelven a unir en orden. Las reglas `string` suman
+        primero los clusters de todas las particiones, como al limpiar un CSV
+        por bloques. Las demás reglas se aplican sobre el DataFrame completo
+        en el proceso principal.
+
+        Args:
+            rules (list): Lista de reglas de limpieza.
+        """
+        with ProcessPoolExecutor(max_workers=self.n_jobs) as executor:
+            segment = []
+            for rule, kwargs in self._iter_rules(rules):
+                if rule in self.ROW_LOCAL_RULES + self.MULTI_PASS_RULES:
+                    segment.append({rule: [kwargs]})
+                    continue
+
+                if segment:
+                    self._clean_partitions(segment, executor)
+                    segment = []
+                self._apply_rule(rule, kwargs)
+
+            if segment:
+                self._clean_partitions(segment, executor)
+
+    def _clean_partitions(self, rules, executor):
+        """Aplica reglas fila a fila sobre particiones del DataFrame.
+
+        Args:
+            rules (list): Lista de reglas fila a fila o `string`.
+            executor (concurrent.futures.Executor): Pool de procesos.
+        """
+        bounds = np.linspace(0, len(self.df), self.n_jobs + 1).astype(int)
+        partitions = [self.df.iloc[start:stop]
+                      for (start, stop) in zip(bounds[:-1], bounds[1:])
+                      if stop > start] or [self.df]
+
+        def collect_groups(replacements):
+            groups = {}
+            for (_, partition_groups, _, _) in executor.map(
+                    self._clean_partition, partitions, repeat(rules),
+                    repeat(replacements), repeat(True)):
+                for (position, new_groups) in partition_groups.items():
+                    merge_fingerprint_groups(
+                        *groups.setdefault(position, ({}, {})), *new_groups)
+            return groups
+
+        replacements = self._resolve_replacements(rules, collect_groups)
+
+        results = list(executor.map(
+            self._clean_partition, partitions, repeat(rules),
+            repeat(replacements), repeat(False)))
+        self.df = self._concat_blocks([df for (df, _, _, _) in results])
+        for (_, _, stats, _) in results:
+            self._merge_stats(*stats)
+        self._rewarn([caught for (_, _, _, caught) in results])
+
+    @staticmethod
+    def _concat_blocks(dfs):
+        """Une bloques de filas limpios con las columnas en el mismo orden.
+
+        Los splits generan columnas extra sólo en los bloques con valores de
+        más partes. Las columnas de todos los bloques se combinan respetando
+        su orden relativo, que es el de una aplicación secuencial.
+
+        Args:
+            dfs (list): Bloques limpios, en orden.
+
+        Returns:
+            pandas.DataFrame: Bloques unidos.
+        """
+        columns = []
+        for df in dfs:
+            previous = None
+            for field in df.columns:
+                if field not in columns:
+                    position = (columns.index(previous) + 1
+                                if previous is not None else 0)
+                    columns.insert(position, field)
+                previous = field
+        return pd.concat(dfs, sort=False).reindex(columns=columns)
+
+    @staticmethod
+    def _clean_partition(df, rules, replacements, collect_groups):
+        """Aplica reglas sobre una partición de filas.
+
+        Returns:
+            tuple: (DataFrame limpio o None si sólo se acumulan clusters,
+                clusters de las reglas `string`, estadísticas, warnings)
+        """
+        dc = DataCleaner._from_dataframe(df)
+        groups = {} if collect_groups else None
+        with warnings.catch_warnings(record=True) as caught:
+            dc._clean_chunk(rules, replacements, groups)
+        if collect_groups:
+            return None, groups, ({}, {}), []
+        return dc.df, groups, (dc.stats, dc._distinct_values), caught
+
+    @staticmethod
+    def _replay_columns(columns, rule, before, after):
+        """Aplica a la lista de columnas global los cambios de una regla.
+
+        Args:
+            columns (list): Columnas del DataFrame completo, se modifica.
+            rule (str): Nombre de la regla.
+            before (list): Columnas del componente antes de la regla.
+            after (list): Columnas del componente después de la regla.
+        """
+        if rule == "renombrar_columnas":
+            for (field, new_field) in zip(before, after):
+                if field != new_field:
+                    columns[columns.index(field)] = new_field
+            return
+
+        for field in before:
+            if field not in after:
+                columns.remove(field)
+
+        # las columnas nuevas se insertan antes de la misma columna que en el
+        # componente, o al final si se agregaron al final
+        for (position, field) in enumerate(after):
+            if field in before:
+                continue
+            following = [other for other in after[position + 1:]
+                         if other in before]
+            if following:
+                columns.insert(columns.index(following[0]), field)
+            else:
+                columns.append(field)
+
+    @staticmethod
+    def _iter_rules(rules):
+        """Recorre una lista de reglas en orden de aplicación.
+
+        Yields:
+            tuple: (nombre de la regla, argumentos de la regla)
         """
         for rule_item in rules:
             for rule in rule_item:
-                rule_method = getattr(self, rule)
                 for kwargs in rule_item[rule]:
-                    kwargs["inplace"] = True
-                    rule_method(**kwargs)
+                    yield rule, kwargs
+
+    def _rule_args(self, rule, kwargs):
+        """Completa los argumentos de una regla con sus valores por defecto.
 
-    def clean_file(self, rules, output_path):
+        Returns:
+            dict: Todos los argumentos con los que se aplicaría la regla.
+        """
+        signature = inspect.signature(getattr(self, rule))
+        bound_args = signature.bind(**kwargs)
+        bound_args.apply_defaults()
+        return dict(bound_args.arguments)
+
+    def _rule_fields(self, rule, kwargs):
+        """Determina los campos que lee y escribe una regla.
+
+        Args:
+            rule (str): Nombre de la regla.
+            kwargs (dict): Argumentos de la regla.
+
+        Returns:
+            tuple: (set de campos leídos, set de campos escritos) o None si
+                la regla opera sobre todo el DataFrame.
+        """
+        args = self._rule_args(rule, kwargs)
+
+        if rule == "remover_columnas":
+            field = self._normalize_field(args["field"], warn=False)
+            return {field}, {field}
+
+        elif rule == "renombrar_columnas":
+            field = self._normalize_field(args["field"], warn=False)
+            new_field = self._normalize_field(args["new_field"], warn=False)
+            return {field}, {field, new_field}
+
+        elif rule in ["nombre_propio", "string", "mail_format", "reemplazar",
+                      "reemplazar_string", "string_regex_substitute",
+                      "fecha_completa", "fecha_simple"]:
+            field = self._normalize_field(args["field"], warn=False)
+            if not args["keep_original"]:
+                return {field}, {field}
+            elif rule == "fecha_completa":
+                return {field}, {"isodatetime_" + field}
+            elif rule == "fecha_simple":
+                return {field}, {"isodate_" + field}
+            else:
+                sufix = args["sufix"] or self.DEFAULT_SUFIX
+                return {field}, {field + "_" + sufix}
+
+        elif rule == "fecha_separada":
+            fields = {self._normalize_field(field[0], warn=False)
+                      for field in args["fields"]}
+            new_field = "isodatetime_" + args["new_field_name"]
+            if args["keep_original"]:
+                return fields, {new_field}
+            return fields, fields | {new_field}
+
+        elif rule in ["string_simple_split", "string_regex_split",
+                      "string_peg_split"]:
+            field = self._normalize_field(args["field"], warn=False)
+            new_fields = {field + "_" + value
+                          for value in args["new_field_names"]}
+            if args["keep_original"]:
+                return {field}, new_fields
+            return {field}, new_fields | {field}
+
+        return None
+
+    def clean_file(self, rules, output_path, cache_dir=None):
         """Aplica las reglas de limpieza y guarda los datos en un csv.
 
+        Si el DataCleaner se creó con `chunksize`, el CSV se limpia y se
+        guarda de a bloques, sin cargarlo completo en memoria.
+
+        Args:
+            rules (list): Lista de reglas de limpieza.
+            cache_dir (str): Directorio donde se guardan los bloques limpios.
+                Si se especifica, sólo se limpian los bloques que no se
+                limpiaron antes con las mismas reglas. Los bloques se
+                definen por posición, por lo que agregar o quitar filas
+                vuelve a limpiar todos los bloques siguientes.
+        """
+        if self.chunksize or cache_dir:
+            self._clean_file_by_chunks(rules, output_path, cache_dir)
+        else:
+            self.clean(rules)
+            self.save(output_path)
+
+    def _clean_file_by_chunks(self, rules, output_path, cache_dir=None):
+        """Limpia el CSV de a bloques, agregando cada uno al CSV de salida.
+
+        Si los datos ya están en memoria, los bloques limpios se vuelven a
+        unir en el DataFrame y se guardan con `save`. En ese caso, desde la
+        primera regla que no puede aplicarse por bloques (ej.:
+        remover_filas_duplicadas), las reglas se aplican con `clean` sobre
+        los bloques ya unidos.
+
+        Args:
+            rules (list): Lista de reglas de limpieza.
+            output_path (str): Ruta al CSV limpio.
+            cache_dir (str): Directorio del cache de bloques limpios.
+        """
+        rules, global_rules = self._split_chunks_rules(rules)
+        if global_rules and self.chunksize:
+            raise ValueError(
+                "La regla '{}' no puede aplicarse por bloques.".format(
+                    next(self._iter_rules(global_rules))[0]))
+
+        cache = BlockCache(cache_dir) if cache_dir else None
+        # las claves del cache dependen de las reglas y la versión
+        rules_key = (hash_object(rules), __version__)
+
+        header_df = self.df
+        fields = None
+        cleaned_chunks = []
+        try:
+            replacements = self._get_chunks_replacements(
+                rules, header_df, cache, rules_key)
+            replacements_key = hash_object(replacements) if cache else None
+            if self.chunksize:
+                fields = self._get_chunks_fields(rules, replacements,
+                                                 header_df)
+                self._to_csv(output_path)
+
+            for chunk in self._iter_chunks(header_df):
+                self.df = chunk
+                if cache:
+                    self._clean_cached_chunk(rules, replacements, cache,
+                                             rules_key + (replacements_key,))
+                else:
+                    self._clean_chunk(rules, replacements)
+
+                if not self.chunksize:
+                    cleaned_chunks.append(self.df)
+                    continue
+
+                # las partes de un split que exceden new_field_names varían
+                # entre bloques: se descartan para escribir siempre los
+                # mismos campos
+                extra_fields = self.df.columns.difference(fields)
+                if len(extra_fields) > 0:
+                    warnings.warn(
+                        "Se descartaron campos que no están en "
+                        "new_field_names: {}".format(
+                            ", ".join(map(str, extra_fields))))
+                self.df = self.df.reindex(columns=fields)
+                self._to_csv(output_path, mode='a', header=False)
+        finally:
+            self.df = header_df
+
+        if cache:
+            logger.info("Resultados por bloque calculados: %d, leídos del "
+                        "cache: %d.", cache.misses, cache.hits)
+            cache.prune()
+        if not self.chunksize:
+            self.df = self._concat_blocks(cleaned_chunks)
+            if global_rules:
+                self.clean(global_rules)
+            self.save(output_path)
+
+    def _split_chunks_rules(self, rules):
+        """Separa las reglas que pueden aplicarse por bloques del resto.
+
+        Returns:
+            tuple: (reglas anteriores a la primera regla que no puede
+                aplicarse por bloques, reglas desde esa regla en adelante)
+        """
+        chunks_rules = []
+        global_rules = []
+        for rule, kwargs in self._iter_rules(rules):
+            if global_rules or rule not in (self.ROW_LOCAL_RULES +
+                                            self.MULTI_PASS_RULES):
+                global_rules.append({rule: [kwargs]})
+            else:
+                chunks_rules.append({rule: [kwargs]})
+        return chunks_rules, global_rules
+
+    def _get_chunks_fields(self, rules, replacements, header_df):
+        """Calcula los campos del CSV limpio aplicando las reglas sin filas.
+
+        Los splits siempre generan los campos de `new_field_names`, por lo
+        que un bloque vacío tiene los campos que comparten todos los bloques.
+
+        Returns:
+            pandas.Index: Campos del CSV limpio.
+        """
+        stats = self._reset_stats()
+        self.df = header_df.iloc[:0].copy()
+        try:
+            self._clean_chunk(rules, replacements)
+            return self.df.columns
+        finally:
+            self.stats, self._distinct_values = stats
+
+    def _clean_cached_chunk(self, rules, replacements, cache, key_parts):
+        """Limpia un bloque, o lo lee del cache si ya se limpió antes.
+
+        Args:
+            rules (list): Lista de reglas de limpieza.
+            replacements (dict): {posición de la regla: reemplazos}
+            cache (BlockCache): Cache de bloques limpios.
+            key_parts (tuple): Partes de la clave que no dependen del bloque.
+        """
+        key = cache.key("bloque_limpio", hash_dataframe(self.df),
+                        *key_parts)
+        cached = cache.get(key)
+        if cached is None:
+            stats = self._reset_stats()
+            try:
+                self._clean_chunk(rules, replacements)
+                cached = (self.df, self.stats, self._distinct_values)
+            finally:
+                self.stats, self._distinct_values = stats
+            cache.set(key, cached)
+
+        self.df, chunk_stats, chunk_distinct_values = cached
+        self._merge_stats(chunk_stats, chunk_distinct_values)
+
+    def _get_chunks_replacements(self, rules, header_df, cache=None,
+                                 rules_key=()):
+        """Calcula los reemplazos de las reglas `string` recorriendo el CSV.
+
+        Cada pasada sobre el CSV acumula los clusters de las reglas `string`
+        cuyos campos no dependen de otra regla `string` todavía sin resolver.
+        Los clusters sólo guardan valores distintos, por lo que la memoria
+        crece con la cantidad de valores distintos y no con la de filas. Si
+        se pasa un cache, los clusters de cada bloque se guardan y sólo se
+        recalculan los de los bloques nuevos o modificados.
+
+        Args:
+            rules (list): Lista de reglas de limpieza.
+            header_df (pandas.DataFrame): DataFrame vacío con los campos
+                normalizados del CSV.
+            cache (BlockCache): Cache de clusters por bloque.
+            rules_key (tuple): Partes de la clave que identifican las reglas.
+
+        Returns:
+            dict: {posición de la regla: {fingerprint: mejor_string}}
+        """
+        def collect_groups(replacements):
+            # las pasadas previas no acumulan estadísticas
+            stats = self._reset_stats()
+            groups = {}
+            replacements_key = hash_object(replacements) if cache else None
+            try:
+                for chunk in self._iter_chunks(header_df):
+                    self.df = chunk
+                    if not cache:
+                        self._clean_chunk(rules, replacements, groups)
+                        continue
+
+                    key = cache.key("clusters", hash_dataframe(chunk),
+                                    replacements_key, *rules_key)
+                    chunk_groups = cache.get(key)
+                    if chunk_groups is None:
+                        chunk_groups = {}
+                        self._clean_chunk(rules, replacements, chunk_groups)
+                        cache.set(key, chunk_groups)
+                    for (position, (clusters, counts)) in \
+                            chunk_groups.items():
+                        all_clusters, all_counts = groups.setdefault(
+                            position, ({}, {}))
+                        merge_fingerprint_groups(all_clusters, all_counts,
+                                                 clusters, counts)
+            finally:
+                self.stats, self._distinct_values = stats
+            return groups
+
+        return self._resolve_replacements(rules, collect_groups)
+
+    def _resolve_replacements(self, rules, collect_groups):
+        """Calcula los reemplazos de las reglas `string` en varias pasadas.
+
         Args:
             rules (list): Lista de reglas de limpieza.
+            collect_groups (callable): Recibe los reemplazos ya calculados,
+                hace una pasada sobre todos los datos y devuelve los clusters
+                acumulados {posición de la regla: (clusters, counts)}.
+
+        Returns:
+            dict: {posición de la regla: {fingerprint: mejor_string}}
+        """
+        positions = [position for position, (rule, kwargs)
+                     in enumerate(self._iter_rules(rules))
+                     if rule == "string"]
+
+        replacements = {}
+        while len(replacements) < len(positions):
+            groups = collect_groups(replacements)
+            for position, (clusters, counts) in groups.items():
+                replacements[position] = get_best_replacements(clusters,
+                                                               counts)
+
+        return replacements
+
+    def _clean_chunk(self, rules, replacements, groups=None):
+        """Aplica las reglas de limpieza a un bloque del CSV.
+
+        Las reglas `string` sin reemplazos calculados no modifican el bloque.
+        Si se pasa `groups`, acumulan ahí los clusters del bloque, siempre
+        que su campo no dependa del resultado de otra regla `string` todavía
+        sin resolver. En ese caso sólo se aplican las reglas de las que
+        dependen esos clusters.
+
+        Args:
+            rules (list): Lista de reglas de limpieza.
+            replacements (dict): {posición de la regla: reemplazos}
+            groups (dict): {posición de la regla: (clusters, counts)}
+        """
+        # campos que dependen de reglas string sin resolver
+        pending_fields = set()
+        collect_positions = (self._collect_positions(rules, replacements)
+                             if groups is not None else None)
+
+        for position, (rule, kwargs) in enumerate(self._iter_rules(rules)):
+            if collect_positions is not None and \
+                    position not in collect_positions:
+                continue
+            input_fields, output_fields = self._rule_fields(rule, kwargs)
+
+            if rule == "string":
+                args = self._rule_args(rule, kwargs)
+                field = self._normalize_field(args["field"])
+
+                if position not in replacements:
+                    if groups is not None and not \
+                            input_fields & pending_fields:
+                        clusters, counts = groups.setdefault(position,
+                                                             ({}, {}))
+                        update_fingerprint_groups(
+                            clusters, counts, self.df[field],
+                            sort_tokens=args["sort_tokens"],
+                            remove_duplicates=args["remove_duplicates"])
+                    pending_fields |= output_fields
+
+                self._replace_strings(field, replacements.get(position, {}),
+                                      sort_tokens=args["sort_tokens"],
+                                      remove_duplicates=args[
+                                          "remove_duplicates"],
+                                      sufix=args["sufix"],
+                                      keep_original=args["keep_original"],
+                                      inplace=True)
+                continue
+
+            if input_fields & pending_fields:
+                pending_fields |= output_fields
+            else:
+                pending_fields -= output_fields
+            self._apply_rule(rule, kwargs)
+
+    def _collect_positions(self, rules, replacements):
+        """Calcula las reglas necesarias para acumular clusters de `string`.
+
+        Son las reglas `string` sin reemplazos calculados y las que escriben,
+        directa o indirectamente, los campos que éstas leen.
+
+        Args:
+            rules (list): Lista de reglas fila a fila o `string`.
+            replacements (dict): {posición de la regla: reemplazos}
+
+        Returns:
+            set: Posiciones de las reglas a aplicar.
         """
-        self.clean(rules)
-        self.save(output_path)
+        items = list(self._iter_rules(rules))
+        positions = set()
+        needed_fields = set()
+        for position in reversed(range(len(items))):
+            rule, kwargs = items[position]
+            input_fields, output_fields = self._rule_fields(rule, kwargs)
+            if (rule == "string" and position not in replacements) or \
+                    output_fields & needed_fields:
+                positions.add(position)
+                needed_fields |= input_fields
+        return positions
 
     def save(self, output_path, geometry_name='geojson',
              geometry_crs='epsg:4326'):
@@ -246,6 +1344,7 @@ Método que llamó al normalizador de campos: {}
 
         El CSV se guarda codificado en UTF-8, separado con "," y usando '"'
         comillas dobles como caracter de enclosing."""
+        self._assert_not_chunked("save")
 
         if isinstance(self.df, gpd.GeoDataFrame):
             # Convierte la proyección, si puede.
@@ -267,10 +1366,26 @@ Método que llamó al normalizador de campos: {}
             elif output_path.endswith('kml'):
                 self._save_to_kml(output_path)
                 return
+        self._to_csv(output_path)
+
+    def _assert_not_chunked(self, method):
+        """Verifica que los datos estén cargados completos en memoria.
+
+        Con `chunksize` el DataFrame sólo tiene el encabezado del CSV, por lo
+        que limpiarlo o guardarlo generaría un archivo vacío.
+        """
+        if self.chunksize:
+            raise ValueError(
+                "'{}' no puede usarse con un DataCleaner creado con "
+                "chunksize: los datos no están en memoria. Usar "
+                "'clean_file'.".format(method))
+
+    def _to_csv(self, output_path, **kwargs):
+        """Escribe el DataFrame en un CSV con formato estándar."""
         self.df.set_index(self.df.columns[0]).to_csv(
             output_path, encoding=self.OUTPUT_ENCODING,
             sep=self.OUTPUT_SEPARATOR,
-            quotechar=self.OUTPUT_QUOTECHAR)
+            quotechar=self.OUTPUT_QUOTECHAR, **kwargs)
 
     def _save_to_kml(self, output_path):
         aux_file = output_path + '.json'
@@ -289,6 +1404,74 @@ Método que llamó al normalizador de campos: {}
                                   for geometry in geometries]
         del self.df['geometry']
 
+    def _update_stats(self, rule, field, values):
+        """Acumula estadísticas de una regla aplicada sobre un campo.
+
+        Args:
+            rule (str): Nombre de la regla.
+            field (str): Campo sobre el que se aplicó la regla.
+            values (dict): {clave: valor numérico a acumular}
+        """
+        field_stats = self.stats.setdefault(rule, {}).setdefault(field, {})
+        for key, value in values.items():
+            field_stats[key] = field_stats.get(key, 0) + value
+
+    def _reset_stats(self):
+        """Reinicia las estadísticas y devuelve las anteriores.
+
+        Returns:
+            tuple: (estadísticas, valores distintos procesados)
+        """
+        previous = (self.stats, self._distinct_values)
+        self.stats = {}
+        self._distinct_values = {}
+        return previous
+
+    def _merge_stats(self, stats, distinct_values):
+        """Acumula las estadísticas de otro DataCleaner.
+
+        Los valores distintos se unen, para no contar más de una vez los que
+        aparecen en los datos de ambos.
+
+        Args:
+            stats (dict): {regla: {campo: {clave: valor}}}
+            distinct_values (dict): {(regla, campo): set de valores}
+        """
+        for (rule, rule_stats) in stats.items():
+            for (field, field_stats) in rule_stats.items():
+                self._update_stats(rule, field, {
+                    key: value for (key, value) in field_stats.items()
+                    if key not in ("distinct", "ratio")})
+                if (rule, field) in distinct_values:
+                    self._add_distinct_values(
+                        rule, field, distinct_values[(rule, field)])
+
+    def _update_distinct_stats(self, rule, field, series):
+        """Acumula la proporción de valores distintos que procesó una regla.
+
+        Las reglas que procesan una sola vez cada valor distinto registran en
+        `self.stats[rule][field]` la cantidad de valores distintos no nulos
+        ("distinct"), la cantidad de filas ("total") y su cociente ("ratio").
+
+        Args:
+            rule (str): Nombre de la regla.
+            field (str): Campo sobre el que se aplicó la regla.
+            series (pandas.Series): Valores procesados por la regla.
+        """
+        self._update_stats(rule, field, {"total": len(series)})
+        self._add_distinct_values(rule, field, series.dropna().unique())
+
+    def _add_distinct_values(self, rule, field, values):
+        """Suma valores distintos de una regla y recalcula su proporción."""
+        distinct_values = self._distinct_values.setdefault((rule, field),
+                                                           set())
+        distinct_values.update(values)
+        field_stats = self.stats[rule][field]
+        field_stats["distinct"] = len(distinct_values)
+        field_stats["ratio"] = (float(field_stats["distinct"]) /
+                                field_stats["total"]
+                                if field_stats["total"] else 0.0)
+
     def _update_series(self, field, new_series,
                        keep_original=False, prefix=None, sufix=None):
         """Agrega o pisa una serie nueva en el DataFrame."""
@@ -378,7 +1561,7 @@ Método que llamó al normalizador de campos: {}
         sufix = sufix or self.DEFAULT_SUFIX
         field = self._normalize_field(field)
         series = self.df[field]
-        capitalized = series.apply(capitalize, lower_words=lower_words)
+        capitalized = capitalize_series(series, lower_words=lower_words)
 
         if inplace:
             self._update_series(field=field, sufix=sufix,
@@ -399,15 +1582,37 @@ Método que llamó al normalizador de campos: {}
         Returns:
             pandas.Series: Serie de strings limpios.
         """
-        sufix = sufix or self.DEFAULT_SUFIX
         field = self._normalize_field(field)
         series = self.df[field]
 
-        clusters, counts = group_fingerprint_strings(
-            series, sort_tokens=sort_tokens,
-            remove_duplicates=remove_duplicates)
+        # calcula los fingerprints una sola vez por valor distinto
+        keys = fingerprint_keyer_series(series, sort_tokens=sort_tokens,
+                                        remove_duplicates=remove_duplicates)
+        clusters, counts = group_fingerprint_strings(series, keys=keys)
         replacements = get_best_replacements(clusters, counts)
-        parsed_series = pd.Series(replace_by_key(replacements, series))
+
+        return self._replace_strings(field, replacements, keys=keys,
+                                     sufix=sufix, keep_original=keep_original,
+                                     inplace=inplace)
+
+    def _replace_strings(self, field, replacements, sort_tokens=False,
+                         remove_duplicates=False, keys=None, sufix=None,
+                         keep_original=False, inplace=False):
+        """Reemplaza los strings de un campo por los mejores de su cluster.
+
+        Args:
+            field (str): Campo a limpiar.
+            replacements (dict): {fingerprint: string_mas_usada}
+            keys (pandas.Series): Fingerprints del campo, si ya se calcularon.
+
+        Returns:
+            pandas.Series: Serie de strings limpios.
+        """
+        sufix = sufix or self.DEFAULT_SUFIX
+        series = self.df[field]
+        parsed_series = replace_by_key_series(
+            replacements, series, sort_tokens=sort_tokens,
+            remove_duplicates=remove_duplicates, keys=keys)
         parsed_series = parsed_series.str.strip()
 
         if inplace:
@@ -432,8 +1637,7 @@ Método que llamó al normalizador de campos: {}
         """
         sufix = sufix or self.DEFAULT_SUFIX
         field = self._normalize_field(field)
-        series = self.df[field].str.lower()
-        series = series.str.findall('[a-z_0-9\.]+@[a-z_0-9\.]+').str.join(", ")
+        series = self._format_mails(self.df[field])
 
         if inplace:
             self._update_series(field=field, sufix=sufix,
@@ -442,10 +1646,19 @@ Método que llamó al normalizador de campos: {}
 
         return series
 
+    @staticmethod
+    def _format_mails(series):
+        series = series.str.lower()
+        return series.str.findall('[a-z_0-9\.]+@[a-z_0-9\.]+').str.join(", ")
+
     def reemplazar(self, field, replacements, sufix=None,
                    keep_original=False, inplace=False):
         """Reemplaza listas de valores por un nuevo valor.
 
+        Todos los reemplazos se aplican en una sola pasada sobre la columna.
+        La cantidad de valores reemplazados por cada valor nuevo se acumula
+        en `self.stats["reemplazar"][field]`.
+
         Args:
             field (str): Campo a limpiar
             replacements (dict): {"new_value": ["old_value1", "old_value2"]}
@@ -455,10 +1668,8 @@ Método que llamó al normalizador de campos: {}
         """
         sufix = sufix or self.DEFAULT_SUFIX
         field = self._normalize_field(field)
-        series = self.df[field]
-
-        for new_value, old_values in replacements.items():
-            series = series.replace(old_values, new_value)
+        series, counts = self._replace_values(self.df[field], replacements)
+        self._update_stats("reemplazar", field, counts)
 
         if inplace:
             self._update_series(field=field, sufix=sufix,
@@ -467,11 +1678,76 @@ Método que llamó al normalizador de campos: {}
 
         return series
 
+    @classmethod
+    def _replace_values(cls, series, replacements, weights=None):
+        """Reemplaza valores de una serie según un diccionario de reemplazos.
+
+        Args:
+            series (pandas.Series): Valores a reemplazar.
+            replacements (dict): {"new_value": ["old_value1", "old_value2"]}
+            weights (numpy.ndarray): Cantidad de filas que representa cada
+                valor de `series`. Por defecto cada valor es una fila.
+
+        Returns:
+            tuple: (serie con los valores reemplazados, {"new_value": cantidad
+                de filas reemplazadas})
+        """
+        series = series.copy()
+        table = cls._get_replacements_table(replacements)
+        replaced = series.isin(list(table))
+        new_values = series[replaced].map(table)
+        series[replaced] = new_values
+
+        counts = {new_value: 0 for new_value in replacements}
+        if weights is None:
+            counts.update(new_values.value_counts().to_dict())
+        else:
+            counts.update(pd.Series(weights[replaced.values]).groupby(
+                new_values.values).sum().to_dict())
+        return series, counts
+
+    @staticmethod
+    def _get_replacements_table(replacements):
+        """Invierte un diccionario de reemplazos en una tabla de valores.
+
+        Compone los reemplazos en el orden del diccionario, por lo que la
+        tabla da el mismo resultado que aplicarlos uno por uno (por ejemplo,
+        si "a" se reemplaza por "b" y luego "b" por "c", "a" termina en "c").
+
+        Args:
+            replacements (dict): {"new_value": ["old_value1", "old_value2"]}
+
+        Returns:
+            dict: {"old_value": "new_value"}
+        """
+        table = {}
+        # valores originales que actualmente terminan en cada valor nuevo
+        sources = {}
+
+        for new_value, old_values in replacements.items():
+            if isinstance(old_values, str):
+                old_values = [old_values]
+
+            moved = []
+            for old_value in set(old_values):
+                moved.extend(sources.pop(old_value, []))
+                if old_value not in table:
+                    moved.append(old_value)
+
+            for original in moved:
+                table[original] = new_value
+            sources.setdefault(new_value, []).extend(moved)
+
+        return table
+
     def reemplazar_string(self, field, replacements, sufix=None,
                           keep_original=False, inplace=False):
         """Reemplaza listas de strings por un nuevo string.
            A diferencias de la funcion reemplazar hace reemplazos parciales.
 
+        Todos los reemplazos se aplican en una sola pasada: en cada posición
+        se reemplaza el substring más largo que coincida.
+
         Args:
             field (str): Campo a limpiar
             replacements (dict): {"new_value": ["old_value1", "old_value2"]}
@@ -481,15 +1757,7 @@ Método que llamó al normalizador de campos: {}
         """
         sufix = sufix or self.DEFAULT_SUFIX
         field = self._normalize_field(field)
-        series = self.df[field]
-
-        for new_value, old_values in replacements.items():
-            # for old_value in sorted(old_values, key=len, reverse=True):
-            for old_value in old_values:
-                replace_function = partial(self._safe_replace,
-                                           old_value=old_value,
-                                           new_value=new_value)
-                series = map(replace_function, series)
+        series = replace_substrings(self.df[field], replacements)
 
         if inplace:
             self._update_series(field=field, sufix=sufix,
@@ -498,13 +1766,6 @@ Método que llamó al normalizador de campos: {}
 
         return series
 
-    @staticmethod
-    def _safe_replace(string, old_value, new_value):
-        if pd.isnull(string):
-            return pd.np.nan
-        else:
-            return str(string).replace(old_value, new_value)
-
     def fecha_completa(self, field, time_format, keep_original=False,
                        inplace=False):
         """Regla para fechas completas que están en un sólo campo.
@@ -518,8 +1779,9 @@ Método que llamó al normalizador de campos: {}
         """
         field = self._normalize_field(field)
         series = self.df[field]
-        parsed_series = series.apply(self._parse_datetime,
-                                     args=(time_format,))
+        parsed_series = parse_datetime_series(series, time_format)
+        self._update_distinct_stats("fecha_completa", field, series)
+
         if inplace:
             self._update_series(field=field, prefix="isodatetime",
                                 keep_original=keep_original,
@@ -540,8 +1802,8 @@ Método que llamó al normalizador de campos: {}
         """
         field = self._normalize_field(field)
         series = self.df[field]
-        parsed_series = series.apply(self._parse_date,
-                                     args=(time_format,))
+        parsed_series = parse_date_series(series, time_format)
+        self._update_distinct_stats("fecha_simple", field, series)
 
         if inplace:
             self._update_series(field=field, prefix="isodate",
@@ -550,35 +1812,6 @@ Método que llamó al normalizador de campos: {}
 
         return parsed_series
 
-    @staticmethod
-    def _parse_datetime(value, time_format):
-        try:
-            datetime = arrow.get(
-                value, time_format,
-                tzinfo=tz.gettz("America/Argentina/Buenos Aires"))
-            print(value, time_format, datetime, "funciona")
-            return datetime.isoformat()
-        except:
-            print(value, time_format, "no funciona")
-            return ""
-
-    @staticmethod
-    def _parse_date(value, time_format):
-        try:
-            datetime = arrow.get(
-                value, time_format,
-                tzinfo=tz.gettz("America/Argentina/Buenos Aires"))
-            date = datetime.isoformat().split("T")[0]
-
-            if "D" in time_format:
-                return date
-            elif "M" in time_format:
-                return "-".join(date.split("-")[:-1])
-            else:
-                return "-".join(date.split("-")[:-2])
-        except:
-            return ""
-
     def fecha_separada(self, fields, new_field_name, keep_original=True,
                        inplace=False):
         """Regla para fechas completas que están separadas en varios campos.
@@ -593,17 +1826,16 @@ Método que llamó al normalizador de campos: {}
         field_names = [self._normalize_field(field[0]) for field in fields]
         time_format = " ".join([field[1] for field in fields])
 
-        # print(time_format)
-        # print(self.df[field_names])
-        concat_series = self.df[field_names].apply(
-            lambda x: ' '.join(x.map(str)),
-            axis=1
-        )
-        print(concat_series)
+        columns = [self.df[field].map(str) for field in field_names]
+        concat_series = columns[0].str.cat(columns[1:], sep=" ")
 
-        parsed_series = concat_series.apply(self._parse_datetime,
-                                            args=(time_format,))
-        print(parsed_series)
+        parsed_series = parse_datetime_series(concat_series, time_format)
+        self._update_distinct_stats("fecha_separada", new_field_name,
+                                    concat_series)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("fecha_separada: %d de %d fechas de %s no tienen "
+                         "el formato '%s'", (parsed_series == "").sum(),
+                         len(parsed_series), field_names, time_format)
 
         if inplace:
             self.df["isodatetime_" + new_field_name] = parsed_series
@@ -628,13 +1860,15 @@ Método que llamó al normalizador de campos: {}
         """
         field = self._normalize_field(field)
         series = self.df[field]
-        parsed_df = series.apply(self._split, args=(separators,))
+        parsed_df = self._split_series(series, separators)
 
         parsed_df.rename(
             columns={key: field + "_" + value
                      for key, value in enumerate(new_field_names)},
             inplace=True
         )
+        parsed_df = self._add_missing_fields(
+            parsed_df, [field + "_" + value for value in new_field_names])
 
         if inplace:
             self.df = pd.concat([self.df, parsed_df], axis=1)
@@ -644,22 +1878,59 @@ Método que llamó al normalizador de campos: {}
         return parsed_df
 
     @staticmethod
-    def _split(value, separators):
-        values = []
-        for separator in separators:
-            if separator in str(value):
-                values = [str(split_value) for split_value in
-                          value.split(separator)]
-                break
+    def _add_missing_fields(parsed_df, fields):
+        """Agrega como columnas vacías los campos que no generó un split.
 
-        return pd.Series([str(value).strip() for value in values
-                          if pd.notnull(value)])
+        Garantiza que el resultado de un split tenga siempre los mismos
+        campos, aunque ningún valor haya podido separarse.
+        """
+        for field in fields:
+            if field not in parsed_df.columns:
+                parsed_df[field] = np.nan
+        return parsed_df
+
+    @staticmethod
+    def _split_series(series, separators):
+        """Separa una serie de strings por el primer separador que contengan.
+
+        Cada separador se aplica de una sola vez sobre todos los valores que
+        lo contienen y todavía no fueron separados por uno anterior.
+
+        Returns:
+            pandas.DataFrame: Una columna por cada parte (0, 1, ...), con las
+                partes sin espacios en los extremos. Los valores sin ningún
+                separador quedan vacíos.
+        """
+        strings = series.map(str)
+        pending = np.ones(len(series), dtype=bool)
+
+        splits = []
+        for separator in separators:
+            contains = strings.str.contains(separator, regex=False).values
+            positions = np.flatnonzero(pending & contains)
+            if len(positions):
+                parts = strings.iloc[positions].str.split(
+                    re.escape(separator), expand=True)
+                splits.append((positions, parts))
+                pending[positions] = False
+
+        n_columns = max([parts.shape[1] for _, parts in splits] or [0])
+        values = np.full((len(series), n_columns), np.nan, dtype=object)
+        for (positions, parts) in splits:
+            stripped = parts.apply(lambda column: column.str.strip())
+            values[positions, :parts.shape[1]] = stripped.where(
+                stripped.notnull(), np.nan).values
+
+        return pd.DataFrame(values, index=series.index)
 
     def string_regex_split(self, field, pattern, new_field_names,
                            keep_original=True, inplace=False):
         """Regla para separar un campo a partir de una expresión regular.
 
-        TODO!!! Falta implementar este método.
+        Cada grupo de la expresión regular genera un nuevo campo. Si los
+        grupos tienen nombre (ej.: "(?P<nombre>...)"), se asignan a los
+        campos de `new_field_names` con ese nombre; si no, se asignan en
+        orden. Los valores que no coinciden con la expresión quedan vacíos.
 
         Args:
             field (str): Campo a limpiar.
@@ -668,10 +1939,62 @@ Método que llamó al normalizador de campos: {}
                 valores separados.
 
         Returns:
-            pandas.Series: Serie de strings limpios
+            pandas.DataFrame: Campos separados.
         """
         field = self._normalize_field(field)
-        pass
+        series = self.df[field]
+        regex = self._compile_regex(pattern)
+
+        # cada valor distinto se evalúa una sola vez
+        codes, uniques = pd.factorize(series)
+        extracted = pd.Series(uniques, dtype=object).str.extract(
+            regex, expand=True)
+        if regex.groupindex:
+            extracted = extracted.reindex(columns=new_field_names)
+        else:
+            extracted = extracted.iloc[:, :len(new_field_names)]
+            extracted.columns = new_field_names[:extracted.shape[1]]
+
+        parsed_df = self._broadcast_distinct_rows(
+            extracted.values, codes, series.index)
+        parsed_df.columns = [field + "_" + value
+                             for value in extracted.columns]
+        parsed_df = self._add_missing_fields(
+            parsed_df, [field + "_" + value for value in new_field_names])
+
+        if inplace:
+            self.df = pd.concat([self.df, parsed_df], axis=1)
+        if not keep_original:
+            self.remover_columnas(field)
+
+        return parsed_df
+
+    @staticmethod
+    @lru_cache(maxsize=REGEX_CACHE_SIZE)
+    def _compile_regex(pattern):
+        """Compila una expresión regular una sola vez por proceso."""
+        return re.compile(pattern)
+
+    @staticmethod
+    def _broadcast_distinct_rows(distinct_rows, codes, index):
+        """Propaga los resultados de los valores distintos a todas las filas.
+
+        Args:
+            distinct_rows (numpy.ndarray): Una fila de resultados por cada
+                valor distinto.
+            codes (numpy.ndarray): Códigos de `pandas.factorize`, donde -1
+                corresponde a los valores nulos.
+            index (pandas.Index): Índice de la serie original.
+
+        Returns:
+            pandas.DataFrame: Resultados de cada fila. Las filas de valores
+                nulos quedan vacías.
+        """
+        # la última fila corresponde a los valores nulos (código -1)
+        rows = np.vstack([
+            distinct_rows.astype(object),
+            np.full((1, distinct_rows.shape[1]), np.nan, dtype=object)])
+        return pd.DataFrame(rows.take(codes, axis=0), index=index)
 
     def string_peg_split(self, field, grammar, new_field_names,
                          keep_original=True, inplace=False):
@@ -688,13 +2011,26 @@ Método que llamó al normalizador de campos: {}
         """
         field = self._normalize_field(field)
         series = self.df[field]
-        parsed_df = series.apply(self._split_with_peg, args=(grammar,))
+
+        # cada valor distinto se parsea una sola vez
+        codes, uniques = pd.factorize(series)
+        distinct_values = [self._split_with_peg(value, grammar)
+                           for value in uniques]
+        distinct_rows = np.full(
+            (len(uniques), max(map(len, distinct_values), default=0)),
+            np.nan, dtype=object)
+        for (position, values) in enumerate(distinct_values):
+            distinct_rows[position, :len(values)] = values
+        parsed_df = self._broadcast_distinct_rows(
+            distinct_rows, codes, series.index)
 
         parsed_df.rename(
             columns={key: field + "_" + value
                      for key, value in enumerate(new_field_names)},
             inplace=True
         )
+        parsed_df = self._add_missing_fields(
+            parsed_df, [field + "_" + value for value in new_field_names])
 
         if inplace:
             self.df = pd.concat([self.df, parsed_df], axis=1)
@@ -703,21 +2039,28 @@ Método que llamó al normalizador de campos: {}
 
         return parsed_df
 
-    def _split_with_peg(self, value, grammar):
-        if grammar in self.grammars:
-            comp_grammar = self.grammars[grammar]
-        else:
-            comp_grammar = parsley.makeGrammar(grammar, {})
-            self.grammars[grammar] = comp_grammar
+    @staticmethod
+    @lru_cache(maxsize=PEG_CACHE_SIZE)
+    def _split_with_peg(value, grammar):
+        """Separa un valor con una PEG.
+
+        Los resultados se guardan en una cache acotada por (valor, grammar).
 
+        Returns:
+            tuple: Valores separados como strings, vacía si la PEG falla.
+        """
         try:
-            values = comp_grammar(value).values()
+            values = DataCleaner._compile_grammar(grammar)(value).values()
         except:
             values = []
 
-        values = [str(split_value) for split_value in values]
+        return tuple(str(split_value) for split_value in values)
 
-        return pd.Series(values)
+    @staticmethod
+    @lru_cache(maxsize=GRAMMAR_CACHE_SIZE)
+    def _compile_grammar(grammar):
+        """Compila una PEG una sola vez por proceso."""
+        return parsley.makeGrammar(grammar, {})
 
     def string_regex_substitute(self, field, regex_str_match,
                                 regex_str_sub, sufix=None,
@@ -782,10 +2125,6 @@ Método que llamó al normalizador de campos: {}
             pandas.Series: Serie de unidades territoriales normalizadas y
                 limpias.
         """
-        if len(self.df) > 100000:
-            print('El número máximo de unidades a normalizar es de 100000.')
-            return
-
         if not self._validate_entity_level(entity_level):
             print('"{}" no es un nivel de entidad válido.'.format(entity_level))
             return
@@ -794,46 +2133,45 @@ Método que llamó al normalizador de campos: {}
             if not self._validate_filters(entity_level, filters):
                 return self.df
 
-        data = self._build_data(field, entity_level, filters)
+        data, codes = self._build_data(field, entity_level, filters)
         if data:
             res = self._get_api_response(entity_level, data)
 
             if 'error' in res:
                 print(res['error'])
+                return self.df
 
+            # columnas a actualizar: [(columna, atributo del resultado)]
+            columns = []
             if keep_original:
                 field_normalized = str(field + '_normalized')
-                self._update_column(field_normalized, NAME, entity_level, res)
+                columns.append((field_normalized, NAME))
             else:
-                self._update_column(field, NAME, entity_level, res)
+                columns.append((field, NAME))
 
             if add_code:
                 column_code = entity_level + '_' + ID
-                self._update_column(column_code, ID, entity_level, res)
+                columns.append((column_code, ID))
 
             if add_centroid:
                 column_lat = entity_level + '_' + LAT
                 column_lon = entity_level + '_' + LON
-                self._update_column(column_lat, LAT, entity_level, res)
-                self._update_column(column_lon, LON, entity_level, res)
+                columns.append((column_lat, LAT))
+                columns.append((column_lon, LON))
 
             if add_parents:
                 for parent in add_parents:
                     if entity_level not in PROV and parent in PROV:
-                        self._update_column(
-                            PROV_ID, PROV_ID, entity_level, res)
-                        self._update_column(PROV_NAM, PROV_NAM, entity_level,
-                                            res)
+                        columns.append((PROV_ID, PROV_ID))
+                        columns.append((PROV_NAM, PROV_NAM))
                     if parent in DEPT and entity_level in [MUN, LOC]:
-                        self._update_column(
-                            DEPT_ID, DEPT_ID, entity_level, res)
-                        self._update_column(DEPT_NAM, DEPT_NAM, entity_level,
-                                            res)
+                        columns.append((DEPT_ID, DEPT_ID))
+                        columns.append((DEPT_NAM, DEPT_NAM))
                     if parent in MUN and entity_level in LOC:
-                        self._update_column(MUN_ID, MUN_ID, entity_level, res)
-                        self._update_column(
-                            MUN_NAM, MUN_NAM, entity_level, res)
+                        columns.append((MUN_ID, MUN_ID))
+                        columns.append((MUN_NAM, MUN_NAM))
 
+            self._update_columns(columns, entity_level, res, codes)
             return self.df
         else:
             return
@@ -877,21 +2215,36 @@ Método que llamó al normalizador de campos: {}
         para realizar consultas a la API de normalización Georef utilizando
         el método bulk.
 
+        Se construye una sola consulta por cada combinación distinta del
+        campo a normalizar y los campos de los filtros.
+
         Args:
             field (str): Nombre del campo a normalizar.
             entity_level (str): Nivel de la unidad territorial.
             filters (dict): Diccionario con entidades por las cuales filtrar.
 
         Returns:
-            dict: (dict): Diccionario a utilizar para realizar una consulta.
-            En caso de error devuelve False.
+            tuple: (dict, numpy.ndarray): Diccionario a utilizar para realizar
+            una consulta y posición de la consulta de cada fila. En caso de
+            error devuelve (False, None).
         """
-        body = []
         entity_level = self._plural_entity_level(entity_level)
+        fields = [field] + [filters[key] for key in sorted(filters or {})]
+
+        for name in fields:
+            if name not in self.df.columns:
+                print('Error: No existe el campo "{}".'.format(name))
+                return False, None
 
         try:
-            for item, row in self.df.iterrows():
-                row = row.fillna('0')  # reemplaza valores 'nan' por '0'
+            # reemplaza valores 'nan' por '0'
+            table = self.df[fields].fillna('0')
+            table.columns = range(len(fields))
+            codes = table.groupby(list(table.columns), sort=False).ngroup()
+
+            body = []
+            for values in table.drop_duplicates().itertuples(index=False):
+                row = dict(zip(fields, values))
                 data = {'nombre': row[field], 'max': 1, 'aplanar': True}
 
                 if filters:
@@ -899,19 +2252,18 @@ Método que llamó al normalizador de campos: {}
                     data.update(filters_builded)
                 body.append(data)
 
-            return {entity_level: body}
-        except KeyError as e:
-            print('Error: No existe el campo "{}".'.format(e))
+            return {entity_level: body}, codes.values
         except Exception as e:
             print(e)
-        return False
+        return False, None
 
     @staticmethod
     def _build_filters(row, filters):
         """Contruye un diccionario con filtros de unidades territoriales.
 
         Args:
-            row (pandas.Series): Serie con strings de unidades territoriales.
+            row (dict): Strings de unidades territoriales por campo, sin
+                valores nulos.
             filters (dict): Diccionario con filtros.
 
         Returns:
@@ -922,7 +2274,6 @@ Método que llamó al normalizador de campos: {}
         field_prov = PROV + '_field'
         field_dept = DEPT + '_field'
         field_mun = MUN + '_field'
-        row = row.fillna(0)
 
         # Si existe el filtro y su valor no es 0 lo agrega al diccionario
         if field_prov in filters and row[filters[field_prov]]:
@@ -933,8 +2284,7 @@ Método que llamó al normalizador de campos: {}
             params.update({MUN: row[filters[field_mun]]})
         return params
 
-    @staticmethod
-    def _get_api_response(entity_level, data):
+    def _get_api_response(self, entity_level, data):
         """Realiza búsquedas sobre un listado de entidades en simultáneo
         utilizando el método bulk de la API de normalización Georef.
 
@@ -946,7 +2296,7 @@ Método que llamó al normalizador de campos: {}
         Returns:
             results (list): Lista con resultados de la búsqueda.
         """
-        wrapper = GeorefWrapper()
+        wrapper = self.georef
         if entity_level in PROV:
             results = wrapper.search_province(data)
         elif entity_level in DEPT:
@@ -957,28 +2307,42 @@ Método que llamó al normalizador de campos: {}
             results = wrapper.search_locality(data)
         return results
 
-    def _update_column(self, column, attribute, entity_level, results):
-        """Actualiza una columna específica del DataFrame.
+    def _update_columns(self, columns, entity_level, results, codes):
+        """Actualiza columnas del DataFrame con los resultados de la API.
+
+        Los resultados se convierten una sola vez en una tabla con un
+        atributo por columna, que se alinea con las filas del DataFrame según
+        la consulta de cada fila. Las filas sin resultado conservan su valor.
 
         Args:
-            column (str): Nombre de la columna a agregar y/o actualizar.
-            attribute (str): Nombre del atributo del
+            columns (list): Pares (columna a agregar y/o actualizar, atributo
+                del resultado), en orden.
             entity_level (str): Nivel de la unidad territorial a consultar.
-            results (list): Resultado de la consulta a la API.
+            results (list): Resultado de cada consulta distinta a la API.
+            codes (numpy.ndarray): Posición de la consulta de cada fila.
 
         Return:
             None
         """
         entity_level = self._plural_entity_level(entity_level)
 
-        if column not in self.df:
-            self.df[column] = None
-
-        idx = 0
-        for row in results:
-            if row[entity_level]:
-                self.df.loc[idx, column] = row[entity_level][0][attribute]
-            idx += 1
+        matches = [row[entity_level][0] if row[entity_level] else {}
+                   for row in results]
+        attributes = list(OrderedDict.fromkeys(
+            attribute for (column, attribute) in columns))
+        table = pd.DataFrame(matches, columns=attributes,
+                             index=range(len(matches)))
+
+        rows = table.take(codes)
+        rows.index = self.df.index
+        found = np.array([bool(match) for match in matches],
+                         dtype=bool)[codes]
+
+        for (column, attribute) in columns:
+            if column not in self.df:
+                self.df[column] = None
+            self.df[column] = rows[attribute].where(
+                found, self.df[column].values)
 
     @staticmethod
     def _plural_entity_level(entity_level):
@@ -0,0 +1,328 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Parsea columnas de fechas en formatos de arrow de forma vectorizada.
+
+Traduce una vez el formato de arrow (ej.: "DD-MM-YYYY HH:mm") a una expresión
+regular equivalente a la que usa arrow, extrae los componentes de todos los
+valores con `pandas.Series.str.extract` y construye las fechas con
+`pandas.to_datetime`. Los valores que el camino rápido no puede resolver se
+parsean con arrow, por lo que los resultados son idénticos. Cada valor
+distinto se parsea una sola vez.
+"""
+
+import re
+from functools import lru_cache, partial
+
+import arrow
+import pandas as pd
+from dateutil import tz
+
+from .distinct_values import transform_distinct
+
+# mismos tokens que reconoce el parser de arrow, en el mismo orden
+ARROW_TOKEN_RE = re.compile(
+    r"(YYY?Y?|MM?M?M?|Do|DD?D?D?|d?d?d?d|HH?|hh?|mm?|ss?|S+|ZZ?Z?|a|A|X)")
+
+# tokens soportados por el camino rápido: (patrón de arrow, componente)
+FAST_TOKENS = {
+    "YYYY": (r"\d{4}", "year"),
+    "YY": (r"\d{2}", "year"),
+    "MM": (r"\d{2}", "month"),
+    "M": (r"\d{1,2}", "month"),
+    "DD": (r"\d{2}", "day"),
+    "D": (r"\d{1,2}", "day"),
+    "HH": (r"\d{2}", "hour"),
+    "H": (r"\d{1,2}", "hour"),
+    "mm": (r"\d{2}", "minute"),
+    "m": (r"\d{1,2}", "minute"),
+    "ss": (r"\d{2}", "second"),
+    "s": (r"\d{1,2}", "second"),
+}
+
+# valores por defecto de arrow para los componentes ausentes del formato
+DEFAULT_COMPONENTS = {"year": 1, "month": 1, "day": 1,
+                      "hour": 0, "minute": 0, "second": 0}
+
+# rangos válidos de cada componente (los años son los que pandas.Timestamp
+# representa completos)
+COMPONENT_RANGES = {
+    "year": (pd.Timestamp.min.year + 1, pd.Timestamp.max.year - 1),
+    "month": (1, 12), "day": (1, 31),
+    "hour": (0, 23), "minute": (0, 59), "second": (0, 59),
+}
+
+# (componente, cantidad de dígitos, separador previo) de las fechas ISO 8601
+ISO_COMPONENTS = [
+    ("year", 4, ""), ("month", 2, "-"), ("day", 2, "-"),
+    ("hour", 2, "T"), ("minute", 2, ":"), ("second", 2, ":"),
+]
+ISO_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+# nombre del grupo que captura el match completo
+MATCH_GROUP = "match"
+
+FORMAT_CACHE_SIZE = 128
+
+# zona horaria por defecto de las fechas
+TIMEZONE = "America/Argentina/Buenos Aires"
+
+
+@lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def compile_format(time_format):
+    """Traduce un formato de arrow a una expresión regular equivalente.
+
+    Sólo se soportan formatos numéricos de año, mes, día, hora, minuto y
+    segundo. Para el resto de los tokens (nombres de meses, AM/PM, zonas
+    horarias, timestamps, etc.) se devuelve None y se usa arrow.
+
+    Args:
+        time_format (str): Formato temporal de arrow.
+
+    Returns:
+        tuple: (regex, tokens) donde regex es el patrón compilado que usa
+            arrow para el formato y tokens la lista de tokens en orden, o
+            None si el formato no se puede parsear de forma vectorizada.
+    """
+    # arrow le da un tratamiento especial a los corchetes y al "#"
+    if "[" in time_format or "#" in time_format:
+        return None
+
+    escaped_format = re.escape(time_format)
+    tokens = []
+    pattern_parts = []
+    position = 0
+    for match in ARROW_TOKEN_RE.finditer(escaped_format):
+        token = match.group(0)
+        if token not in FAST_TOKENS or token in tokens:
+            return None
+        tokens.append(token)
+        pattern_parts.append(escaped_format[position:match.start()])
+        pattern_parts.append(
+            "(?P<{}>{})".format(token, FAST_TOKENS[token][0]))
+        position = match.end()
+    pattern_parts.append(escaped_format[position:])
+
+    # no puede haber dos tokens para el mismo componente
+    components = [FAST_TOKENS[token][1] for token in tokens]
+    if len(set(components)) != len(components):
+        return None
+
+    pattern = "(?P<{}>{})".format(MATCH_GROUP, "".join(pattern_parts))
+    return re.compile(pattern, flags=re.IGNORECASE), tokens
+
+
+@lru_cache(maxsize=None)
+def get_timezone(name=TIMEZONE):
+    """Devuelve la zona horaria de un nombre, buscándola una sola vez.
+
+    Args:
+        name (str): Nombre de la zona horaria (ej.: "America/Argentina/Salta").
+
+    Returns:
+        datetime.tzinfo: Zona horaria correspondiente.
+    """
+    return tz.gettz(name)
+
+
+def parse_datetime(value, time_format, tzinfo):
+    """Parsea un valor con arrow y devuelve la fecha en formato ISO 8601.
+
+    Args:
+        value (str): Fecha a parsear.
+        time_format (str): Formato temporal de arrow.
+        tzinfo (datetime.tzinfo): Zona horaria de la fecha.
+
+    Returns:
+        str: Fecha en formato ISO 8601, o "" si no se pudo parsear.
+    """
+    try:
+        return arrow.get(value, time_format, tzinfo=tzinfo).isoformat()
+    except Exception:
+        return ""
+
+
+def parse_date(value, time_format, tzinfo):
+    """Parsea un valor con arrow y devuelve la fecha sin hora.
+
+    La fecha se trunca según la precisión del formato: día, mes o año.
+
+    Args:
+        value (str): Fecha a parsear.
+        time_format (str): Formato temporal de arrow.
+        tzinfo (datetime.tzinfo): Zona horaria de la fecha.
+
+    Returns:
+        str: Fecha en formato ISO 8601, o "" si no se pudo parsear.
+    """
+    try:
+        datetime = arrow.get(value, time_format, tzinfo=tzinfo)
+    except Exception:
+        return ""
+    return _truncate_date(datetime.isoformat().split("T")[0], time_format)
+
+
+def _truncate_date(date, time_format):
+    if "D" in time_format:
+        return date
+    elif "M" in time_format:
+        return "-".join(date.split("-")[:-1])
+    else:
+        return "-".join(date.split("-")[:-2])
+
+
+def parse_datetime_series(series, time_format, tzinfo=None):
+    """Parsea una serie de fechas y las devuelve en formato ISO 8601.
+
+    Cada valor distinto se parsea una sola vez.
+
+    Args:
+        series (pandas.Series): Fechas a parsear.
+        time_format (str): Formato temporal de arrow.
+        tzinfo (datetime.tzinfo): Zona horaria de las fechas. Por defecto es
+            la de Buenos Aires.
+
+    Returns:
+        pandas.Series: Fechas en formato ISO 8601, o "" para las que no se
+            pudieron parsear.
+    """
+    tzinfo = tzinfo or get_timezone()
+    return transform_distinct(series, partial(
+        _parse_distinct_datetimes, time_format=time_format,
+        tzinfo=tzinfo)).fillna("")
+
+
+def parse_date_series(series, time_format, tzinfo=None):
+    """Parsea una serie de fechas y las devuelve sin hora.
+
+    Cada valor distinto se parsea una sola vez. Las fechas se truncan según
+    la precisión del formato: día, mes o año.
+
+    Args:
+        series (pandas.Series): Fechas a parsear.
+        time_format (str): Formato temporal de arrow.
+        tzinfo (datetime.tzinfo): Zona horaria de las fechas. Por defecto es
+            la de Buenos Aires.
+
+    Returns:
+        pandas.Series: Fechas en formato ISO 8601, o "" para las que no se
+            pudieron parsear.
+    """
+    tzinfo = tzinfo or get_timezone()
+    return transform_distinct(series, partial(
+        _parse_distinct_dates, time_format=time_format,
+        tzinfo=tzinfo)).fillna("")
+
+
+def _parse_distinct_datetimes(series, time_format, tzinfo):
+    naive = _to_naive_datetimes(series, time_format)
+    results = pd.Series("", index=series.index, dtype=object)
+
+    if naive.notnull().any():
+        localized = naive.dt.tz_localize(tzinfo, ambiguous="NaT",
+                                         nonexistent="NaT")
+        parsed = localized.notnull()
+        local_times = naive[parsed]
+        utc_times = localized[parsed].dt.tz_convert("UTC").dt.tz_localize(None)
+        offsets = (local_times - utc_times).dt.total_seconds().astype(int)
+        results[parsed] = (local_times.dt.strftime("%Y-%m-%dT%H:%M:%S") +
+                           offsets.map(_format_utc_offset))
+    else:
+        parsed = naive.notnull()
+
+    _parse_remaining(series, results, parsed, parse_datetime,
+                     time_format, tzinfo)
+    return results
+
+
+def _parse_distinct_dates(series, time_format, tzinfo):
+    naive = _to_naive_datetimes(series, time_format)
+    results = pd.Series("", index=series.index, dtype=object)
+
+    parsed = naive.notnull()
+    if parsed.any():
+        dates = naive[parsed].dt.strftime("%Y-%m-%d")
+        if "D" not in time_format:
+            dates = dates.str[:7] if "M" in time_format else dates.str[:4]
+        results[parsed] = dates
+
+    _parse_remaining(series, results, parsed, parse_date,
+                     time_format, tzinfo)
+    return results
+
+
+def _to_naive_datetimes(series, time_format):
+    """Parsea con el camino rápido los valores que arrow parsearía igual.
+
+    Returns:
+        pandas.Series: Fechas sin zona horaria, NaT para los valores que no
+            se pudieron resolver con el camino rápido.
+    """
+    compiled = compile_format(time_format)
+    if compiled is None or series.empty:
+        return pd.Series(pd.NaT, index=series.index, dtype="datetime64[ns]")
+    regex, tokens = compiled
+
+    # arrow usa re.search: sólo se aceptan los valores cuyo primer match
+    # empieza al principio y abarca todo el string
+    extracted = series.str.extract(regex)
+    matched = extracted[MATCH_GROUP].notnull()
+    matched[matched] = extracted.loc[matched, MATCH_GROUP] == series[matched]
+    extracted = extracted[matched]
+
+    components = {}
+    for token in tokens:
+        values = extracted[token].astype(int)
+        if token == "YY":
+            values = values.where(values > 68, values + 100) + 1900
+        components[FAST_TOKENS[token][1]] = values
+    for (component, default) in DEFAULT_COMPONENTS.items():
+        components.setdefault(component, default)
+    components = pd.DataFrame(components, index=extracted.index)
+
+    # pandas acumula los componentes fuera de rango (ej.: 24:00 es el día
+    # siguiente); esos valores y los años que no representa quedan para arrow
+    in_range = pd.Series(True, index=components.index)
+    for (component, (lower, upper)) in COMPONENT_RANGES.items():
+        in_range &= components[component].between(lower, upper)
+    components = components[in_range]
+
+    naive = pd.Series(pd.NaT, index=series.index, dtype="datetime64[ns]")
+    if not components.empty:
+        naive[components.index] = pd.to_datetime(
+            _format_components(components), format=ISO_FORMAT,
+            errors="coerce")
+    return naive
+
+
+def _format_components(components):
+    """Une los componentes enteros de cada fecha en un string ISO 8601.
+
+    pandas convierte un DataFrame de componentes con aritmética de punto
+    flotante, que pierde precisión en los años lejanos a 1970 (ej.: 1722).
+    """
+    formatted = None
+    for (component, width, separator) in ISO_COMPONENTS:
+        values = components[component].astype(str).str.zfill(width)
+        formatted = values if formatted is None else (
+            formatted + separator + values)
+    return formatted
+
+
+def _parse_remaining(series, results, parsed, parse, time_format, tzinfo):
+    """Parsea con arrow los valores no resueltos por el camino rápido."""
+    remaining = ~parsed & series.notnull()
+    if remaining.any():
+        results[remaining] = series[remaining].apply(
+            parse, args=(time_format, tzinfo))
+
+
+def _format_utc_offset(seconds):
+    """Formatea un offset UTC igual que `datetime.isoformat`."""
+    sign = "-" if seconds < 0 else "+"
+    minutes, seconds = divmod(abs(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    offset = "{}{:02d}:{:02d}".format(sign, hours, minutes)
+    if seconds:
+        offset += ":{:02d}".format(seconds)
+    return offset
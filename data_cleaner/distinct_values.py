@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Aplica transformaciones una sola vez por cada valor distinto.
+
+Las columnas de datos abiertos suelen repetir pocos valores distintos en
+millones de filas. Estas funciones calculan cada transformación sobre los
+valores distintos y luego la propagan a todas las filas.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def transform_distinct(values, function, with_weights=False):
+    """Aplica una transformación vectorizada sobre los valores distintos.
+
+    Args:
+        values (pandas.Series): Valores a transformar.
+        function (callable): Recibe una `pandas.Series` con los valores
+            distintos no nulos y devuelve sus resultados en el mismo orden.
+        with_weights (bool): Si es True, `function` recibe además un
+            `numpy.ndarray` con la cantidad de filas de cada valor distinto.
+
+    Returns:
+        pandas.Series: Resultados para cada fila, con el índice original. Los
+            valores nulos quedan nulos.
+    """
+    if not isinstance(values, pd.Series):
+        values = pd.Series(values, dtype=object)
+
+    codes, uniques = pd.factorize(values)
+    uniques = pd.Series(uniques, dtype=object)
+    if with_weights:
+        weights = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        results = function(uniques, weights)
+    else:
+        results = function(uniques)
+
+    # el último elemento es el resultado de los nulos (código -1)
+    distinct_results = np.empty(len(uniques) + 1, dtype=object)
+    for position, result in enumerate(results):
+        distinct_results[position] = result
+    distinct_results[-1] = np.nan
+
+    return pd.Series(distinct_results.take(codes), index=values.index,
+                     name=values.name)
+
+
+def map_distinct(values, function):
+    """Aplica una función una sola vez por cada valor distinto no nulo.
+
+    Args:
+        values (pandas.Series): Valores a transformar.
+        function (callable): Función a aplicar a cada valor.
+
+    Returns:
+        pandas.Series: Resultados para cada fila, con el índice original. Los
+            valores nulos quedan nulos.
+    """
+    return transform_distinct(
+        values, lambda uniques: [function(value) for value in uniques])
@@ -8,9 +8,13 @@ Utiliza el algoritmo Key Collision: Fingerprint.
 
 import string
 from unidecode import unidecode
-from functools import partial
 import pandas as pd
 
+from .distinct_values import transform_distinct
+
+# tabla precompilada para remover todos los signos de puntuación
+PUNCTUATION_TABLE = str.maketrans("", "", string.punctuation)
+
 
 def fingerprint_keyer(key_string, sort_tokens=False, remove_duplicates=False):
     """Convierte un string en su fingerprint key representation.
@@ -32,14 +36,47 @@ def fingerprint_keyer(key_string, sort_tokens=False, remove_duplicates=False):
     key_string = key_string.strip().lower()
 
     # remove all punctuation and control characters
-    for punct in (set(key_string) & set(string.punctuation)):
-        key_string = key_string.replace(punct, "")
-
-    key_string = key_string.replace("\t", " ")
+    key_string = key_string.translate(PUNCTUATION_TABLE)
 
     # split the string into whitespace-separated tokens
     split_key = key_string.split()
 
+    return _join_tokens(split_key, sort_tokens, remove_duplicates)
+
+
+def fingerprint_keyer_series(raw_strs, sort_tokens=False,
+                             remove_duplicates=False):
+    """Convierte una serie de strings en sus fingerprint keys.
+
+    Calcula el fingerprint de cada valor distinto una sola vez, usando
+    operaciones vectorizadas de `pandas.Series.str`, y lo propaga a todas las
+    filas donde aparece el valor.
+
+    Args:
+        raw_strs (pandas.Series): Strings para convertir en fingerprint keys.
+
+    Returns:
+        pandas.Series: Fingerprints correspondientes al input, con su mismo
+            índice.
+    """
+    def keyer(uniques):
+        split_keys = uniques.map(str).str.strip().str.lower().str.translate(
+            PUNCTUATION_TABLE).str.split()
+        return [_join_tokens(split_key, sort_tokens, remove_duplicates)
+                for split_key in split_keys]
+
+    return transform_distinct(raw_strs, keyer)
+
+
+def _join_tokens(split_key, sort_tokens=False, remove_duplicates=False):
+    """Une los tokens de un string en su fingerprint key.
+
+    Args:
+        split_key (list): Tokens del string, sin puntuación y en minúsculas.
+
+    Returns:
+        str: Fingerprint correspondiente a los tokens.
+    """
     # remove duplicates, if chosen
     if remove_duplicates:
         dups_removed = set(split_key)
@@ -62,30 +99,94 @@ def fingerprint_keyer(key_string, sort_tokens=False, remove_duplicates=False):
 
 
 def group_fingerprint_strings(raw_strs, sort_tokens=False,
-                              remove_duplicates=False):
+                              remove_duplicates=False, keys=None,
+                              weights=None):
     """Clusteriza un conjunto de strings, según sus fingerprints.
 
+    Agrupa por fingerprint y string original en una sola pasada, por lo que
+    el costo es lineal en la cantidad de strings y la memoria de los
+    resultados crece con la cantidad de strings distintos. Los valores nulos
+    no se clusterizan.
+
     Args:
         raw_strs (list): Lista de strings sin procesar.
+        keys (pandas.Series): Fingerprints de `raw_strs`, si ya fueron
+            calculados con `fingerprint_keyer_series`.
+        weights (list): Cantidad de veces que aparece cada string de
+            `raw_strs`, si ya fueron agregados. Por defecto cada uno cuenta 1.
 
     Returns:
         (dict, dict): En el primer dict las keys son los fingerprints y los
-            valores las strings originales. En el segundo las keys son las
-            strings sin normalizar y los valores el conteo de la cantidad de
-            veces que aparecen.
+            valores las strings originales distintas, en orden de aparición.
+            En el segundo las keys son las strings sin normalizar y los
+            valores el conteo de la cantidad de veces que aparecen.
     """
+    if not isinstance(raw_strs, pd.Series):
+        raw_strs = pd.Series(raw_strs, dtype=object)
+    if keys is None:
+        keys = fingerprint_keyer_series(raw_strs, sort_tokens=sort_tokens,
+                                        remove_duplicates=remove_duplicates)
+
+    pairs = pd.DataFrame({"key": keys.values, "raw_str": raw_strs.values})
+    if weights is None:
+        pair_counts = pairs.groupby(["key", "raw_str"], sort=False).size()
+    else:
+        pairs["weight"] = weights
+        pair_counts = pairs.groupby(["key", "raw_str"],
+                                    sort=False)["weight"].sum()
+
     res = {}
     counts = {}
-    fingerprint_keyer_with_args = partial(fingerprint_keyer,
-                                          sort_tokens=sort_tokens,
-                                          remove_duplicates=remove_duplicates)
-    for (key, raw_str) in zip(map(fingerprint_keyer_with_args, raw_strs),
-                              raw_strs):
-        res[key] = res.get(key, []) + [raw_str]
-        counts[raw_str] = counts.get(raw_str, 0) + 1
+    for ((key, raw_str), count) in pair_counts.items():
+        res.setdefault(key, []).append(raw_str)
+        counts[raw_str] = int(count)
     return res, counts
 
 
+def update_fingerprint_groups(clusters, counts, raw_strs, sort_tokens=False,
+                              remove_duplicates=False):
+    """Acumula en clusters existentes un nuevo lote de strings.
+
+    Permite clusterizar una columna procesándola de a bloques. Cada cluster
+    guarda sólo los strings distintos en orden de aparición, por lo que la
+    memoria crece con la cantidad de valores distintos y no con la cantidad
+    de filas.
+
+    Args:
+        clusters (dict): {fingerprint: [raw_string_1, raw_string_2]}
+        counts (dict): {raw_string: cant_veces_utilizada}
+        raw_strs (list): Lote de strings sin procesar.
+    """
+    new_clusters, new_counts = group_fingerprint_strings(
+        raw_strs, sort_tokens=sort_tokens,
+        remove_duplicates=remove_duplicates)
+    merge_fingerprint_groups(clusters, counts, new_clusters, new_counts)
+
+
+def merge_fingerprint_groups(clusters, counts, new_clusters, new_counts):
+    """Acumula en clusters existentes los clusters de otro lote de strings.
+
+    Los strings nuevos se agregan al final de cada cluster, por lo que
+    combinar en orden los clusters de varios lotes da el mismo resultado que
+    clusterizar todos los strings juntos.
+
+    Args:
+        clusters (dict): {fingerprint: [raw_string_1, raw_string_2]}
+        counts (dict): {raw_string: cant_veces_utilizada}
+        new_clusters (dict): Clusters del nuevo lote.
+        new_counts (dict): Conteos del nuevo lote.
+    """
+    for (key, key_strings) in new_clusters.items():
+        cluster = clusters.setdefault(key, [])
+        for raw_str in key_strings:
+            if raw_str not in counts:
+                counts[raw_str] = 0
+                cluster.append(raw_str)
+
+    for (raw_str, count) in new_counts.items():
+        counts[raw_str] += count
+
+
 def get_best_replacements(clusters, counts):
     """Selecciona los strings más utilizados por cluster.
 
@@ -109,3 +210,28 @@ def get_best_replacements(clusters, counts):
 def replace_by_key(replacements, raw_strs):
     """Reemplaza strings por sus mejores equivalentes."""
     return [replacements.get(fingerprint_keyer(s), s) for s in raw_strs]
+
+
+def replace_by_key_series(replacements, raw_strs, sort_tokens=False,
+                          remove_duplicates=False, keys=None):
+    """Reemplaza una serie de strings por sus mejores equivalentes.
+
+    Args:
+        replacements (dict): {fingerprint: string_mas_usada}
+        raw_strs (pandas.Series): Strings sin procesar.
+        keys (pandas.Series): Fingerprints de `raw_strs`, si ya fueron
+            calculados con `fingerprint_keyer_series`.
+
+    Returns:
+        pandas.Series: Strings reemplazados, con el índice de `raw_strs`.
+    """
+    if not isinstance(raw_strs, pd.Series):
+        raw_strs = pd.Series(raw_strs, dtype=object)
+    if not replacements:
+        return raw_strs.copy()
+    if keys is None:
+        keys = fingerprint_keyer_series(raw_strs, sort_tokens=sort_tokens,
+                                        remove_duplicates=remove_duplicates)
+
+    replaced = keys.map(replacements)
+    return replaced.where(replaced.notnull(), raw_strs)
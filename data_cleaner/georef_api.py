@@ -1,8 +1,12 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
 import requests
+from requests.adapters import HTTPAdapter
 
 ID = 'id'
 NAME = 'nombre'
@@ -19,13 +23,63 @@ LOC = 'localidad'
 LAT = 'centroide_lat'
 LON = 'centroide_lon'
 
+GEOREF_URL = "http://apis.datos.gob.ar/georef/api/"
+# cantidad máxima de consultas por request bulk
+MAX_BULK_LEN = 5000
+# requests bulk enviados en simultáneo
+MAX_WORKERS = 4
+# segundos de espera de cada request
+TIMEOUT = 30
+# reintentos de cada request ante errores de conexión o del servidor
+RETRIES = 3
+BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
 
 class GeorefWrapper:
     """Interfaz para la API REST de Georef."""
 
-    def __init__(self):
-        self.url = "http://apis.datos.gob.ar/georef/api/"
-        self.max_bulk_len = 5000
+    def __init__(self, url=GEOREF_URL, max_bulk_len=MAX_BULK_LEN,
+                 max_workers=MAX_WORKERS, timeout=TIMEOUT, retries=RETRIES,
+                 backoff_factor=BACKOFF_FACTOR, cache=None):
+        """Configura los requests a la API.
+
+        La sesión HTTP se crea recién al enviar el primer request, por lo que
+        las subclases que no usan la red (ej.: `GeorefOffline`) no abren
+        conexiones.
+
+        Args:
+            url (str): URL base de la API.
+            max_bulk_len (int): Cantidad máxima de consultas por request.
+            max_workers (int): Cantidad máxima de requests en simultáneo.
+            timeout (float): Segundos de espera de cada request.
+            retries (int): Reintentos de cada request ante errores de
+                conexión o respuestas 429 y 5xx.
+            backoff_factor (float): Los reintentos esperan
+                backoff_factor * 2 ** (número de reintento - 1) segundos.
+            cache (GeorefCache): Cache de resultados. Si se especifica, sólo
+                se envían a la API las consultas que no están en el cache.
+        """
+        self.url = url
+        self.max_bulk_len = max_bulk_len
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.cache = cache
+        self._session = None
+
+    @property
+    def session(self):
+        """Sesión HTTP que reutiliza las conexiones a la API."""
+        if self._session is None:
+            # una conexión keep-alive por request simultáneo
+            self._session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1,
+                                  pool_maxsize=self.max_workers)
+            self._session.mount("http://", adapter)
+            self._session.mount("https://", adapter)
+        return self._session
 
     def search_province(self, data):
         entity = 'provincias'
@@ -44,6 +98,31 @@ class GeorefWrapper:
         return self._get_response(entity, data)
 
     def _get_response(self, entity, data):
+        if not self.cache:
+            return self._get_api_results(entity, data)
+
+        queries = data[entity]
+        keys = [self.cache.key(entity, query) for query in queries]
+        results = self.cache.get_many(keys)
+
+        # cada consulta distinta que no está en el cache se envía una vez
+        pending = {}
+        for (key, query) in zip(keys, queries):
+            if key not in results:
+                pending.setdefault(key, query)
+
+        if pending:
+            new_results = self._get_api_results(
+                entity, {entity: list(pending.values())})
+            if 'error' in new_results:
+                return new_results
+            new_results = dict(zip(pending, new_results))
+            self.cache.set_many(new_results)
+            results.update(new_results)
+
+        return [results[key] for key in keys]
+
+    def _get_api_results(self, entity, data):
         result = []
         result_partial = []
         data_len = len([i for i in data[entity] if i])
@@ -56,12 +135,21 @@ class GeorefWrapper:
         else:
             data = [data]
 
-        for row in data:
-            r = requests.post(resource, json=row)
-            if 'resultados' in r.content.decode('utf8'):
-                result_partial.append(json.loads(r.content)['resultados'])
+        # envía los bloques en simultáneo, manteniendo su orden; la sesión
+        # se crea antes de repartir los bloques entre los threads
+        post = partial(self._post, self.session, resource)
+        if len(data) > 1 and self.max_workers > 1:
+            with ThreadPoolExecutor(
+                    max_workers=min(self.max_workers, len(data))) as executor:
+                responses = list(executor.map(post, data))
+        else:
+            responses = [post(row) for row in data]
+
+        for response in responses:
+            if 'resultados' in response:
+                result_partial.append(response['resultados'])
             else:
-                error = self._get_first_error(json.loads(r.content)['errores'])
+                error = self._get_first_error(response['errores'])
                 return {'error': error}
 
         for row in result_partial:
@@ -73,6 +161,39 @@ class GeorefWrapper:
 
         return result
 
+    def _post(self, session, resource, body):
+        """Envía un request bulk, reintentándolo ante errores transitorios.
+
+        Args:
+            session (requests.Session): Sesión HTTP.
+            resource (str): URL del recurso de la API.
+            body (dict): Consultas a enviar.
+
+        Returns:
+            dict: Respuesta de la API.
+        """
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(self.backoff_factor * 2 ** (attempt - 1))
+
+            try:
+                r = session.post(resource, json=body, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.retries:
+                    raise
+                continue
+
+            if r.status_code not in RETRY_STATUSES:
+                try:
+                    return r.json()
+                except ValueError:
+                    # los errores sin JSON (ej.: páginas HTML de un proxy)
+                    # se informan con su código HTTP
+                    r.raise_for_status()
+                    raise
+            if attempt == self.retries:
+                r.raise_for_status()
+
     @staticmethod
     def _getrows_byslice(entity, seq, rowlen):
         data_slice = []
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Guarda en disco los resultados de las consultas a la API de Georef.
+
+Los resultados se guardan en una base SQLite, indexados por el nivel de la
+entidad y la consulta (nombre y filtros). Vencen después de un tiempo (TTL) y,
+si se supera la cantidad máxima de resultados, se eliminan los usados hace
+más tiempo (LRU).
+"""
+
+import json
+import sqlite3
+import time
+
+# segundos que se conserva cada resultado
+TTL = 30 * 24 * 60 * 60
+# cantidad máxima de resultados guardados
+MAX_ENTRIES = 1000000
+# cantidad máxima de claves por consulta SQL
+SQL_BATCH_SIZE = 500
+# cantidad de resultados guardados entre cada eliminación de los vencidos
+EXPIRE_INTERVAL = 10000
+
+
+class GeorefCache(object):
+    """Cache de resultados de Georef en una base SQLite."""
+
+    def __init__(self, path, ttl=TTL, max_entries=MAX_ENTRIES):
+        """Abre la base del cache, creándola si no existe.
+
+        Args:
+            path (str): Ruta al archivo SQLite.
+            ttl (float): Segundos que se conserva cada resultado.
+            max_entries (int): Cantidad máxima de resultados guardados.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._connection = None
+        self._connect()
+
+    def __getstate__(self):
+        # la conexión se vuelve a abrir en otro proceso
+        state = self.__dict__.copy()
+        state["_connection"] = None
+        return state
+
+    def _connect(self):
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path)
+            with self._connection:
+                self._connection.execute(
+                    "CREATE TABLE IF NOT EXISTS resultados ("
+                    "clave TEXT PRIMARY KEY, resultado TEXT NOT NULL, "
+                    "creado REAL NOT NULL, usado REAL NOT NULL)")
+                self._connection.execute(
+                    "CREATE INDEX IF NOT EXISTS resultados_usado "
+                    "ON resultados (usado)")
+                self._connection.execute(
+                    "CREATE INDEX IF NOT EXISTS resultados_creado "
+                    "ON resultados (creado)")
+            self._expire()
+        return self._connection
+
+    def _expire(self):
+        """Elimina los resultados vencidos.
+
+        Se ejecuta al abrir la base y cada `EXPIRE_INTERVAL` resultados
+        guardados; entre tanto, las búsquedas ignoran los vencidos.
+        """
+        with self._connection:
+            self._connection.execute(
+                "DELETE FROM resultados WHERE creado < ?",
+                (time.time() - self.ttl,))
+        self._writes = 0
+
+    @property
+    def hit_rate(self):
+        """Proporción de consultas respondidas por el cache."""
+        total = self.hits + self.misses
+        return float(self.hits) / total if total else 0.0
+
+    @staticmethod
+    def key(entity, query):
+        """Construye la clave de una consulta.
+
+        Args:
+            entity (str): Nivel de la entidad (ej.: "localidades").
+            query (dict): Consulta a la API, con el nombre y los filtros.
+
+        Returns:
+            str: Clave de la consulta.
+        """
+        return json.dumps([entity, query], sort_keys=True)
+
+    def get_many(self, keys):
+        """Busca los resultados vigentes de varias consultas.
+
+        Args:
+            keys (list): Claves de las consultas.
+
+        Returns:
+            dict: {clave: resultado} de las consultas encontradas.
+        """
+        connection = self._connect()
+        now = time.time()
+        unique_keys = list(set(keys))
+        results = {}
+        with connection:
+            for start in range(0, len(unique_keys), SQL_BATCH_SIZE):
+                batch = unique_keys[start:start + SQL_BATCH_SIZE]
+                placeholders = ", ".join("?" * len(batch))
+                rows = connection.execute(
+                    "SELECT clave, resultado FROM resultados "
+                    "WHERE clave IN ({}) AND creado >= ?".format(
+                        placeholders), batch + [now - self.ttl])
+                results.update((key, json.loads(result))
+                               for (key, result) in rows)
+                connection.execute(
+                    "UPDATE resultados SET usado = ? "
+                    "WHERE clave IN ({})".format(placeholders),
+                    [now] + batch)
+
+        hits = sum(1 for key in keys if key in results)
+        self.hits += hits
+        self.misses += len(keys) - hits
+        return results
+
+    def set_many(self, results):
+        """Guarda los resultados de varias consultas.
+
+        Si se supera `max_entries`, elimina los resultados usados hace más
+        tiempo.
+
+        Args:
+            results (dict): {clave: resultado}
+        """
+        connection = self._connect()
+        now = time.time()
+        with connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO resultados VALUES (?, ?, ?, ?)",
+                [(key, json.dumps(result), now, now)
+                 for (key, result) in results.items()])
+            connection.execute(
+                "DELETE FROM resultados WHERE clave IN ("
+                "SELECT clave FROM resultados "
+                "ORDER BY usado DESC, rowid DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,))
+
+        self._writes += len(results)
+        if self._writes >= EXPIRE_INTERVAL:
+            self._expire()
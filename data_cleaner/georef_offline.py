@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Responde consultas de Georef sin conexión, con un nomenclador local.
+
+El nomenclador es uno o más archivos JSON con el formato de las descargas
+completas de la API de Georef ({"provincias": [...], "localidades": [...]}).
+Las unidades territoriales se indexan por su nombre normalizado y por su
+fingerprint, por lo que cada consulta se resuelve con búsquedas en
+diccionarios, sin acceso a la red.
+"""
+
+import json
+
+from .fingerprint_keyer import fingerprint_keyer
+from .georef_api import GeorefWrapper, ID, NAME, PROV, DEPT, MUN
+
+ENTITIES = ['provincias', 'departamentos', 'municipios', 'localidades']
+# filtros de las consultas, que se comparan con el id o el nombre del padre
+FILTERS = [PROV, DEPT, MUN]
+
+
+def normalize_name(name):
+    """Normaliza un nombre: minúsculas, sin acentos ni puntuación."""
+    return fingerprint_keyer(name)
+
+
+def fingerprint_name(name):
+    """Calcula el fingerprint de un nombre, sin importar el orden."""
+    return fingerprint_keyer(name, sort_tokens=True, remove_duplicates=True)
+
+
+def flatten_record(record, prefix=""):
+    """Aplana una unidad territorial igual que el parámetro `aplanar`.
+
+    Args:
+        record (dict): Unidad territorial (ej.: {"centroide": {"lat": 1}}).
+
+    Returns:
+        dict: Unidad territorial aplanada (ej.: {"centroide_lat": 1}).
+    """
+    flat_record = {}
+    for (key, value) in record.items():
+        if isinstance(value, dict):
+            flat_record.update(flatten_record(value, prefix + key + "_"))
+        else:
+            flat_record[prefix + key] = value
+    return flat_record
+
+
+class GeorefOffline(GeorefWrapper):
+    """Interfaz de Georef que responde las consultas con un nomenclador local.
+
+    Devuelve los resultados con el mismo formato que `GeorefWrapper`, por lo
+    que puede usarse en su lugar al crear un `DataCleaner`.
+    """
+
+    def __init__(self, gazetteer_paths, cache=None):
+        """Carga el nomenclador en memoria.
+
+        Args:
+            gazetteer_paths (str or list): Rutas a archivos JSON con
+                unidades territoriales.
+            cache (GeorefCache): Cache de resultados.
+        """
+        super(GeorefOffline, self).__init__(cache=cache)
+        if isinstance(gazetteer_paths, str):
+            gazetteer_paths = [gazetteer_paths]
+
+        # {entidad: ({nombre normalizado: [unidades]}, {fingerprint: [...]})}
+        self.index = {entity: ({}, {}) for entity in ENTITIES}
+        for path in gazetteer_paths:
+            with open(path, encoding="utf-8") as gazetteer_file:
+                gazetteer = json.load(gazetteer_file)
+            for entity in ENTITIES:
+                for record in gazetteer.get(entity, []):
+                    self._add_record(entity, flatten_record(record))
+
+    def _add_record(self, entity, record):
+        names, fingerprints = self.index[entity]
+        names.setdefault(normalize_name(record[NAME]), []).append(record)
+        fingerprints.setdefault(
+            fingerprint_name(record[NAME]), []).append(record)
+
+    def _get_api_results(self, entity, data):
+        return [self._search(entity, query) for query in data[entity]]
+
+    def _search(self, entity, query):
+        """Busca la primera unidad territorial que coincide con una consulta.
+
+        Primero se busca por nombre normalizado y, si ninguna unidad cumple
+        los filtros, por fingerprint.
+
+        Returns:
+            dict: {entidad: [unidad territorial]}, o {entidad: []} si no se
+                encontró ninguna.
+        """
+        names, fingerprints = self.index[entity]
+        filters = {parent: normalize_name(query[parent])
+                   for parent in FILTERS if parent in query}
+
+        for (index, key) in [(names, normalize_name(query[NAME])),
+                             (fingerprints, fingerprint_name(query[NAME]))]:
+            for record in index.get(key, []):
+                if self._match_filters(record, filters):
+                    return {entity: [record]}
+        return {entity: []}
+
+    @staticmethod
+    def _match_filters(record, filters):
+        """Verifica que los padres de una unidad coincidan con los filtros.
+
+        Args:
+            record (dict): Unidad territorial aplanada.
+            filters (dict): {padre: id o nombre normalizado}
+        """
+        for (parent, value) in filters.items():
+            parent_id = record.get(parent + '_' + ID)
+            parent_name = record.get(parent + '_' + NAME)
+            if value not in (normalize_name(parent_id),
+                             normalize_name(parent_name)):
+                return False
+        return True
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Reemplaza múltiples substrings en una sola pasada.
+
+Compila un diccionario de reemplazos en una única expresión regular con una
+alternativa por substring, ordenadas de la más larga a la más corta.
+"""
+
+import re
+from functools import lru_cache
+
+from .distinct_values import map_distinct
+
+# cantidad máxima de diccionarios de reemplazos compilados en cache
+REPLACER_CACHE_SIZE = 128
+
+
+def compile_replacements(replacements):
+    """Compila un diccionario de reemplazos de substrings.
+
+    En cada posición del string se reemplaza el substring más largo que
+    coincida. Si un mismo substring aparece para varios valores nuevos, se
+    usa el primero. Los diccionarios compilados se guardan en cache.
+
+    Args:
+        replacements (dict): {"new_value": ["old_value1", "old_value2"]}
+
+    Returns:
+        callable: Función que recibe un string y devuelve el string con todos
+            los reemplazos aplicados.
+    """
+    replacements_key = tuple((new_value, tuple(old_values))
+                             for new_value, old_values in replacements.items())
+    return _compile_replacements(replacements_key)
+
+
+@lru_cache(maxsize=REPLACER_CACHE_SIZE)
+def _compile_replacements(replacements):
+    table = {}
+    for new_value, old_values in replacements:
+        for old_value in old_values:
+            if old_value:
+                table.setdefault(old_value, new_value)
+
+    if not table:
+        return lambda string: string
+
+    pattern = re.compile("|".join(
+        re.escape(old_value)
+        for old_value in sorted(table, key=len, reverse=True)))
+
+    def replace(string):
+        return pattern.sub(lambda match: table[match.group(0)], string)
+
+    return replace
+
+
+def replace_substrings(series, replacements):
+    """Reemplaza listas de substrings en una serie, en una sola pasada.
+
+    Cada valor distinto se procesa una sola vez.
+
+    Args:
+        series (pandas.Series): Strings a limpiar.
+        replacements (dict): {"new_value": ["old_value1", "old_value2"]}
+
+    Returns:
+        pandas.Series: Serie de strings con los reemplazos aplicados.
+    """
+    replace = compile_replacements(replacements)
+    return map_distinct(series, lambda value: replace(str(value)))
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""test_block_cache.py
+
+Tests for `block_cache.py` module.
+"""
+
+import unittest
+import nose
+import os
+import shutil
+import tempfile
+import time
+import pandas as pd
+
+from data_cleaner.block_cache import BlockCache, hash_dataframe, hash_object
+
+import sys
+sys.path.insert(0, '')
+
+
+class BlockCacheUnitTestCase(unittest.TestCase):
+    """Testea el funcionamiento del cache de bloques."""
+
+    def test_hash_dataframe(self):
+        """Testea que el hash dependa del contenido y no del índice."""
+        df = pd.DataFrame({"a": ["x", None], "b": ["1", "2"]})
+
+        self.assertEqual(hash_dataframe(df),
+                         hash_dataframe(df.set_index(pd.Index([5, 6]))))
+        self.assertNotEqual(hash_dataframe(df), hash_dataframe(df[::-1]))
+        self.assertNotEqual(hash_dataframe(df),
+                            hash_dataframe(df.rename(columns={"a": "c"})))
+
+    def test_hash_object(self):
+        """Testea que el hash dependa del orden de las claves."""
+        # los reemplazos se aplican en orden, por lo que su orden cambia el
+        # resultado de la regla
+        rule = {"field": "a", "replacements": {"x": ["a"], "y": ["x"]}}
+        reordered = {"field": "a", "replacements": {"y": ["x"], "x": ["a"]}}
+        self.assertNotEqual(
+            hash_object([{"reemplazar_string": [rule]}]),
+            hash_object([{"reemplazar_string": [reordered]}]))
+        self.assertNotEqual(hash_object([{"a": 1}]), hash_object([{"a": 2}]))
+
+    def test_get_set(self):
+        """Testea que se recuperen los objetos guardados."""
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        cache = BlockCache(cache_dir)
+        key = cache.key("bloque", hash_object([1]), "0.2.1")
+
+        self.assertIsNone(cache.get(key))
+        cache.set(key, ({"a": 1}, [2]))
+        self.assertEqual(BlockCache(cache_dir).get(key), ({"a": 1}, [2]))
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+    def test_prune(self):
+        """Testea que se eliminen los resultados vencidos y los más viejos."""
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        cache = BlockCache(cache_dir, max_age=60)
+        for (key, age) in [("vencido", 120), ("viejo", 30), ("nuevo", 0)]:
+            cache.set(key, key * 100)
+            used = time.time() - age
+            os.utime(os.path.join(cache_dir, key + ".pkl"), (used, used))
+
+        cache.prune()
+        self.assertIsNone(cache.get("vencido"))
+        self.assertEqual(cache.get("viejo"), "viejo" * 100)
+
+        # "viejo" se acaba de usar, por lo que "nuevo" es el más viejo
+        cache.max_size = os.path.getsize(os.path.join(cache_dir,
+                                                      "viejo.pkl"))
+        cache.prune()
+        self.assertIsNone(cache.get("nuevo"))
+        self.assertEqual(cache.get("viejo"), "viejo" * 100)
+
+
+if __name__ == '__main__':
+    nose.run(defaultTest=__name__)
@@ -8,9 +8,12 @@ Tests for `capitalizer.py` module.
 
 import unittest
 import nose
+import pandas as pd
 
 from data_cleaner.capitalizer import normalize_word
 from data_cleaner.capitalizer import capitalize
+from data_cleaner.capitalizer import capitalize_series
+from data_cleaner.capitalizer import capitalize_cache_info
 
 import sys
 sys.path.insert(0, '')
@@ -35,6 +38,19 @@ class CapitalizerIntegrationTestCase(unittest.TestCase):
         for (inp, outp) in test_strings:
             self.assertEqual(capitalize(inp), outp)
 
+    def test_capitalize_series(self):
+        """Testea la capitalización de una serie por valores distintos."""
+        series = pd.Series(["JUAN DE LA VACA", None, u"o'higgins",
+                            "JUAN DE LA VACA"] * 3, index=range(10, 22))
+        exp = ["Juan De la Vaca", None, u"O'Higgins", "Juan De la Vaca"] * 3
+
+        misses = capitalize_cache_info().misses
+        res = capitalize_series(series, lower_words=["la"])
+
+        self.assertEqual(list(res.index), list(series.index))
+        self.assertEqual([i if pd.notnull(i) else None for i in res], exp)
+        self.assertLessEqual(capitalize_cache_info().misses - misses, 2)
+
 
 class CapitalizerKeyerUnitTestCase(unittest.TestCase):
     """Testea el funcionamiento de cada método del Capitalizer."""
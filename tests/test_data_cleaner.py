@@ -7,15 +7,22 @@ Unit tests for `data_cleaner.py` module. Si los tests no corren, correr desde
 la línea de comandos: `chmod 644 test_data_cleaner.py`
 """
 
+import datetime
 import unittest
 import nose
 import os
+import shutil
+import tempfile
+import threading
+import warnings
+import numpy as np
 import pandas as pd
 import vcr
 import geopandas as gpd
-from data_cleaner import DataCleaner
+from data_cleaner import DataCleaner, GeorefWrapper
 from data_cleaner.data_cleaner import DuplicatedField
 from .rules.integration import rules
+from .test_georef_api import StubGeorefServer
 import csv
 
 import sys
@@ -84,6 +91,274 @@ class DataCleanerIntegrationTestCase(unittest.TestCase):
                 nan_safe_list(df[col]), nan_safe_list(df_exp[col])
             )
 
+    def test_integration_by_chunks(self):
+        dc = DataCleaner(get_input("integration"), chunksize=3)
+        dc.clean_file(rules, get_output("temp_integration_chunks"))
+
+        df = pd.read_csv(get_output("temp_integration_chunks"))
+        df_exp = pd.read_csv(get_output("integration"))
+
+        self.assertEqual(set(df.columns), set(df_exp.columns))
+        for col in df.columns:
+            self.assertEqual(
+                nan_safe_list(df[col]), nan_safe_list(df_exp[col])
+            )
+
+    def test_string_by_chunks(self):
+        rules = [{"nombre_propio": [{"field": "dependencia",
+                                     "keep_original": True}]},
+                 {"string": [{"field": "dependencia_normalizado"}]},
+                 {"string": [{"field": "dependencia_normalizado",
+                              "keep_original": True}]}]
+
+        dc = DataCleaner(get_input("integration"))
+        dc.clean_file(rules, get_output("temp_string"))
+        dc = DataCleaner(get_input("integration"), chunksize=2)
+        dc.clean_file(rules, get_output("temp_string_chunks"))
+
+        df = pd.read_csv(get_output("temp_string_chunks"))
+        df_exp = pd.read_csv(get_output("temp_string"))
+
+        self.assertEqual(list(df.columns), list(df_exp.columns))
+        for col in df.columns:
+            self.assertEqual(
+                nan_safe_list(df[col]), nan_safe_list(df_exp[col])
+            )
+
+    def test_split_by_chunks(self):
+        split_rules = [{"string_simple_split": [
+            {"field": "sujeto_obligado", "separators": [","],
+             "new_field_names": ["apellido", "nombre"]}]}]
+
+        dc = DataCleaner(get_input("string_separable_simple"))
+        dc.clean(split_rules)
+        # un bloque posterior genera más partes que new_field_names
+        dc_chunks = DataCleaner(get_input("string_separable_simple"),
+                                chunksize=1)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            dc_chunks.clean_file(split_rules, get_output("temp_split_chunks"))
+
+        df = pd.read_csv(get_output("temp_split_chunks"))
+        self.assertEqual(list(df.columns), [
+            "sujeto_obligado", "sujeto_obligado_apellido",
+            "sujeto_obligado_nombre"])
+        for col in df.columns:
+            self.assertEqual(nan_safe_list(df[col]),
+                             nan_safe_list(dc.df[col]))
+        self.assertTrue(any("new_field_names" in str(warning.message)
+                            for warning in caught))
+
+    def test_clean_and_save_by_chunks(self):
+        dc = DataCleaner(get_input("integration"), chunksize=2)
+
+        with self.assertRaises(ValueError):
+            dc.clean(rules)
+        with self.assertRaises(ValueError):
+            dc.save(get_output("temp_integration_chunks"))
+
+    def test_clean_parallel(self):
+        parallel_rules = rules + [
+            {"renombrar_columnas": [{"field": "lugar_audiencia",
+                                     "new_field": "lugar"}]},
+            {"remover_filas_duplicadas": [{}]},
+            {"mail_format": [{"field": "lugar", "keep_original": True}]},
+            {"remover_columnas": [{"field": "hora_audiencia"}]},
+            {"fecha_simple": [{"field": "fecha_audiencia",
+                               "time_format": "DD-MM-YYYY",
+                               "keep_original": True}]}
+        ]
+
+        dc = DataCleaner(get_input("integration"))
+        dc.clean(parallel_rules)
+        dc_parallel = DataCleaner(get_input("integration"))
+        dc_parallel.clean(parallel_rules, max_workers=2)
+
+        self.assertEqual(list(dc_parallel.df.columns), list(dc.df.columns))
+        self.assertTrue(dc_parallel.df.equals(dc.df))
+        self.assertEqual(dc_parallel.stats, dc.stats)
+
+    def test_clean_by_partitions(self):
+        partition_rules = rules + [
+            {"remover_filas_duplicadas": [{}]},
+            {"string": [{"field": "dependencia", "sufix": "cluster",
+                         "keep_original": True}]},
+            {"fecha_simple": [{"field": "fecha_audiencia",
+                               "time_format": "DD-MM-YYYY",
+                               "keep_original": True}]}
+        ]
+
+        dc = DataCleaner(get_input("integration"))
+        dc.clean(partition_rules)
+        dc_partitions = DataCleaner(get_input("integration"), n_jobs=3)
+        dc_partitions.clean(partition_rules)
+
+        self.assertEqual(list(dc_partitions.df.columns), list(dc.df.columns))
+        self.assertTrue(dc_partitions.df.equals(dc.df))
+        # los valores distintos repetidos entre particiones se cuentan una vez
+        self.assertEqual(dc_partitions.stats, dc.stats)
+
+    def test_split_by_partitions(self):
+        # sólo la segunda partición tiene valores con más de dos partes
+        split_rules = [
+            {"string_simple_split": [
+                {"field": "sujeto_obligado", "separators": [","],
+                 "new_field_names": ["apellido", "nombre"]}]},
+            {"string_simple_split": [
+                {"field": "sujeto_obligado", "separators": ["Cargo:"],
+                 "new_field_names": ["persona", "cargo"]}]}
+        ]
+
+        dc = DataCleaner(get_input("string_separable_simple"))
+        dc.clean(split_rules)
+        dc_partitions = DataCleaner(get_input("string_separable_simple"),
+                                    n_jobs=3)
+        dc_partitions.clean(split_rules)
+
+        self.assertEqual(list(dc_partitions.df.columns), list(dc.df.columns))
+        self.assertTrue(dc_partitions.df.equals(dc.df))
+
+    def test_collect_only_string_inputs(self):
+        collect_rules = [
+            {"fecha_simple": [{"field": "fecha_audiencia",
+                               "time_format": "DD-MM-YYYY",
+                               "keep_original": True}]},
+            {"nombre_propio": [{"field": "dependencia"}]},
+            {"string": [{"field": "dependencia"}]}
+        ]
+        dc = DataCleaner(get_input("integration"))
+        groups = {}
+        dc._clean_chunk(collect_rules, {}, groups)
+
+        # la regla de fechas no afecta a los clusters, por lo que no se aplica
+        self.assertNotIn("isodate_fecha_audiencia", dc.df.columns)
+        self.assertEqual(list(groups), [2])
+
+    def test_clean_fused_rules(self):
+        fused_rules = rules + [
+            {"reemplazar": [{"field": "dependencia", "replacements": {
+                "Salud": ["Ministerio De Salud"]}}]},
+            {"string_regex_substitute": [{"field": "lugar_audiencia",
+                                          "regex_str_match": "a",
+                                          "regex_str_sub": "b"}]},
+            {"string": [{"field": "lugar_audiencia", "sort_tokens": True}]},
+            {"nombre_propio": [{"field": "dependencia"}]},
+            {"reemplazar_string": [{"field": "dependencia",
+                                    "replacements": {"Z": ["a"]}}]}
+        ]
+
+        dc = DataCleaner(get_input("integration"))
+        for (rule, kwargs) in dc._iter_rules(fused_rules):
+            getattr(dc, rule)(**dict(kwargs, inplace=True))
+        dc_fused = DataCleaner(get_input("integration"))
+        dc_fused.clean(fused_rules)
+
+        self.assertEqual(list(dc_fused.df.columns), list(dc.df.columns))
+        self.assertTrue(dc_fused.df.equals(dc.df))
+        self.assertEqual(dc_fused.stats, dc.stats)
+
+    def test_fused_rules_restore_current_rule(self):
+        dc = DataCleaner(get_input("integration"))
+        dc._current_rule = "clean"
+        dc._apply_fused_rules("dependencia", [
+            ("nombre_propio", {"field": "dependencia"}),
+            ("string", {"field": "dependencia"})])
+
+        self.assertEqual(dc._current_rule, "clean")
+
+    def test_explain(self):
+        plan_rules = [
+            {"nombre_propio": [{"field": "dependencia"}]},
+            {"string": [{"field": "dependencia"}]},
+            {"fecha_simple": [{"field": "fecha_audiencia",
+                               "time_format": "DD-MM-YYYY",
+                               "keep_original": True}]},
+            {"remover_columnas": [{"field": "isodate_fecha_audiencia"}]},
+            {"remover_filas_duplicadas": [{}]}
+        ]
+
+        dc = DataCleaner(get_input("integration"))
+        self.assertEqual(dc.explain(plan_rules).split("\n"), [
+            '1. fusionar sobre "dependencia": nombre_propio -> string',
+            '2. omitir fecha_simple sobre "fecha_audiencia" '
+            '(sus resultados no se usan)',
+            '3. omitir remover_columnas sobre "isodate_fecha_audiencia" '
+            '(sus resultados no se usan)',
+            '4. aplicar remover_filas_duplicadas sobre todos los campos'
+        ])
+
+        dc.clean(plan_rules)
+        self.assertNotIn("isodate_fecha_audiencia", dc.df.columns)
+        self.assertNotIn("fecha_simple", dc.stats)
+
+    def test_clean_file_with_cache(self):
+        cache_rules = [
+            {"nombre_propio": [{"field": "dependencia"}]},
+            {"fecha_simple": [{"field": "fecha_audiencia",
+                               "time_format": "DD-MM-YYYY"}]}
+        ]
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        changed_input = os.path.join(cache_dir, "changed.csv")
+        with open(get_input("integration")) as input_file:
+            with open(changed_input, "w") as changed_file:
+                changed_file.write(input_file.read().replace(
+                    '"Jorge, Oscar Mario"', '"Jorge, Oscar"'))
+
+        dc = DataCleaner(get_input("integration"))
+        dc.clean_file(cache_rules, get_output("temp_cache"))
+
+        for (input_path, computed) in [(get_input("integration"), 3),
+                                       (get_input("integration"), 0),
+                                       (changed_input, 1)]:
+            dc_cache = DataCleaner(input_path)
+            dc_cache.CACHE_BLOCK_SIZE = 2
+            with self.assertLogs("data_cleaner.data_cleaner") as logs:
+                dc_cache.clean_file(cache_rules,
+                                    get_output("temp_cache_blocks"),
+                                    cache_dir=cache_dir)
+            self.assertIn("calculados: {}, leídos del cache: {}".format(
+                computed, 3 - computed), logs.output[-1])
+            if input_path == get_input("integration"):
+                self.assertEqual(dc_cache.stats, dc.stats)
+
+        df = pd.read_csv(get_output("temp_cache_blocks"))
+        df_exp = pd.read_csv(get_output("temp_cache"))
+        self.assertEqual(list(df.dependencia), list(df_exp.dependencia))
+        self.assertEqual(list(df.solicitante)[-1], "Jorge, Oscar")
+
+    def test_global_rule_with_cache(self):
+        global_rules = [
+            {"nombre_propio": [{"field": "col1"}]},
+            {"remover_filas_duplicadas": [{}]},
+            {"mail_format": [{"field": "col2", "keep_original": True}]}
+        ]
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+
+        dc = DataCleaner(get_input("filas_duplicadas"))
+        dc.clean_file(global_rules, get_output("temp_filas_duplicadas"))
+        dc_cache = DataCleaner(get_input("filas_duplicadas"))
+        dc_cache.CACHE_BLOCK_SIZE = 2
+        dc_cache.clean_file(global_rules,
+                            get_output("temp_filas_duplicadas_cache"),
+                            cache_dir=cache_dir)
+
+        df = pd.read_csv(get_output("temp_filas_duplicadas_cache"))
+        df_exp = pd.read_csv(get_output("temp_filas_duplicadas"))
+        self.assertEqual(len(df), 3)
+        self.assertEqual(list(df.columns), list(df_exp.columns))
+        for col in df.columns:
+            self.assertEqual(nan_safe_list(df[col]),
+                             nan_safe_list(df_exp[col]))
+
+    def test_global_rule_by_chunks(self):
+        dc = DataCleaner(get_input("filas_duplicadas"), chunksize=2)
+
+        with self.assertRaises(ValueError):
+            dc.clean_file([{"remover_filas_duplicadas": [{}]}],
+                          get_output("temp_filas_duplicadas"))
+
 
 class DataCleanerShapefileConversionTestCase(unittest.TestCase):
     """Testea la conversión de archivos Shapefile a otros formatos."""
@@ -133,6 +408,30 @@ class DataCleanerSingleMethodsTestCase(unittest.TestCase):
 
         self.assertNotEqual(encoding, 'utf-8')
 
+    def test_get_encoding_from_sample(self):
+        input_path = BASE_DIR + '/input/non_unicode.csv'
+
+        # una muestra ASCII de un archivo más grande no alcanza para
+        # asegurar que todo el archivo sea ASCII
+        dc = DataCleaner(input_path, encoding_sample_size=300)
+        encoding = dc._get_file_encoding(input_path, sample_size=300)
+
+        self.assertEqual(encoding, 'utf-8')
+
+    def test_get_encoding_from_sections(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        input_path = os.path.join(tmp_dir, "utf8.csv")
+        # los caracteres no ASCII aparecen recién después del primer bloque
+        with open(input_path, "w", encoding="utf-8") as input_file:
+            input_file.write("Juan Perez,Buenos Aires\n" * 200)
+            input_file.write("áéíóú,ñ\n" * 2000)
+
+        dc = DataCleaner(input_path, encoding_sample_size=3000)
+        encoding = dc._get_file_encoding(input_path, sample_size=3000)
+
+        self.assertEqual(encoding, 'UTF-8')
+
     def test_cleaning_fields(self):
         input_path = get_input("fields")
         output_path = get_output("fields")
@@ -151,12 +450,48 @@ class DataCleanerSingleMethodsTestCase(unittest.TestCase):
 
         self.assertEqual(list(dc.df.columna), list(df.columna))
 
+    def test_remove_all_line_breaks_mixed_types(self):
+        df = pd.DataFrame({"texto": ["a\nb", None, 3, "c"],
+                           "numero": [1.5, 2.0, np.nan, 4.0]})
+        res = DataCleaner._remove_all_line_breaks(df.copy())
+
+        self.assertEqual(list(res.texto), ["a b", None, 3, "c"])
+        self.assertTrue(res.numero.equals(df.numero))
+
+    def test_remove_all_line_breaks_without_strings(self):
+        df = pd.DataFrame({
+            "numero": pd.Series([1, 2.5, None], dtype=object),
+            "fecha": pd.Series([datetime.datetime(2018, 1, 1), None,
+                                datetime.datetime(2018, 1, 2)]).astype(object),
+            "bytes": [b"a\nb", None, b"c"]})
+        res = DataCleaner._remove_all_line_breaks(df.copy())
+
+        self.assertEqual(list(res.numero), [1, 2.5, None])
+        self.assertEqual(list(res.fecha), list(df.fecha))
+        self.assertEqual(list(res.bytes), [b"a\nb", None, b"c"])
+
     def test_repeated_fields(self):
         input_path = get_input("repeated_fields")
 
         with self.assertRaises(DuplicatedField):
             DataCleaner(input_path)
 
+    def test_normalize_field_warns_once(self):
+        dc = DataCleaner(get_input("nombre_propio"))
+        field_rules = [{"nombre_propio": [{"field": "Dependencia"}]},
+                       {"mail_format": [{"field": "Dependencia"}]},
+                       {"remover_columnas": [{"field": "Dependencia"}]}]
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            dc.clean(field_rules)
+
+        messages = [str(warning.message) for warning in caught
+                    if "Dependencia" in str(warning.message)]
+        self.assertEqual(len(messages), 1)
+        self.assertIn("normalizador de campos: nombre_propio", messages[0])
+        self.assertNotIn("dependencia", dc.df.columns)
+
     def test_remover_columnas(self):
         input_path = get_input("nombre_propio")
         field = "dependencia"
@@ -302,6 +637,17 @@ class DataCleanerSingleMethodsTestCase(unittest.TestCase):
         exp = list(df[field])
 
         self.assertEqual(res, exp)
+        self.assertEqual(dc.stats["reemplazar"][field],
+                         {"Servicios": 2, "Otros": 3})
+
+    def test_reemplazar_chained(self):
+        replacements = {"Serv": ["S"], "Servicios": ["Serv", "Servs"],
+                        "Otros": ["Otro"], "Otro": ["Loc"]}
+        table = DataCleaner._get_replacements_table(replacements)
+
+        self.assertEqual(table, {"S": "Servicios", "Serv": "Servicios",
+                                 "Servs": "Servicios", "Otro": "Otros",
+                                 "Loc": "Otro"})
 
     def test_reemplazar_string(self):
         input_path = get_input("reemplazar_string")
@@ -379,6 +725,12 @@ class DataCleanerSingleMethodsTestCase(unittest.TestCase):
 
         self.assertEqual(res, exp)
 
+        stats = dc.stats["fecha_simple"][field]
+        self.assertEqual(stats["total"], len(dc.df))
+        self.assertEqual(stats["distinct"], dc.df[field].nunique())
+        self.assertEqual(stats["ratio"],
+                         float(stats["distinct"]) / stats["total"])
+
     def test_fecha_separada(self):
         input_path = get_input("fecha_separada")
         output_path = get_output("fecha_separada")
@@ -398,6 +750,17 @@ class DataCleanerSingleMethodsTestCase(unittest.TestCase):
 
         self.assertEqual(res, exp)
 
+    def test_fecha_separada_debug_log(self):
+        input_path = get_input("fecha_separada")
+        dc = DataCleaner(input_path)
+
+        with self.assertLogs("data_cleaner.data_cleaner", "DEBUG") as logs:
+            dc.fecha_separada([["fecha_audiencia", "DD-MM-YYYY"],
+                               ["hora_audiencia", "HH:mm"]], "audiencia")
+
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn("DD-MM-YYYY HH:mm", logs.output[0])
+
     def test_string_simple_split(self):
         input_path = get_input("string_separable_simple")
         output_path = get_output("string_separable_simple")
@@ -420,9 +783,56 @@ class DataCleanerSingleMethodsTestCase(unittest.TestCase):
         self.assertEqual(res_1, exp_1)
         self.assertEqual(res_2, exp_2)
 
-    @unittest.skip("skip")
+    def test_split_series(self):
+        series = pd.Series(["a - b; c", "d ; e", "f", None],
+                           index=[2, 2, 3, 4])
+        res = DataCleaner._split_series(series, ["-", ";"])
+
+        self.assertEqual(list(res.index), [2, 2, 3, 4])
+        self.assertEqual([nan_safe_list(res[column]) for column in res], [
+            ["a", "d", None, None], ["b; c", "e", None, None]])
+
     def test_string_regex_split(self):
-        pass
+        input_path = get_input("string_separable_complejo")
+        output_path = get_output("string_separable_complejo")
+
+        # obtengo el resultado de limpiar el csv
+        dc = DataCleaner(input_path)
+        parsed_df = dc.string_regex_split(
+            "solicitante",
+            r"^(?P<nombre>[^()\d]+?)\s*(?:\((?P<cargo>[^)]*)\))?"
+            r"\s*(?:DNI\s*(?P<dni>\d+))?$",
+            ["nombre", "cargo", "dni"]
+        )
+        res_1 = nan_safe_list(parsed_df["solicitante_nombre"])
+        res_2 = nan_safe_list(parsed_df["solicitante_cargo"])
+        res_3 = nan_safe_list(parsed_df["solicitante_dni"])
+
+        # cargo el csv limpio para comparar
+        df = pd.read_csv(output_path, encoding="utf-8")
+        exp_1 = nan_safe_list(df["solicitante_nombre"])
+        exp_2 = nan_safe_list(df["solicitante_cargo"])
+        exp_3 = nan_safe_list(df["solicitante_dni"])
+
+        self.assertEqual(res_1, exp_1)
+        self.assertEqual(res_2, exp_2)
+        self.assertEqual(res_3, exp_3)
+
+    def test_string_regex_split_unnamed_groups(self):
+        input_path = get_input("string_separable_complejo")
+        dc = DataCleaner(input_path)
+        dc.string_regex_split("solicitante", r"^([^,]+), (\w+)",
+                              ["apellido", "nombre", "dni"],
+                              inplace=True)
+
+        self.assertEqual(
+            nan_safe_list(dc.df["solicitante_apellido"]),
+            ["Jorge", "Jorge", None, "Jorge", "Jorge"])
+        self.assertEqual(
+            nan_safe_list(dc.df["solicitante_nombre"]),
+            ["Oscar", "Oscar", None, "Oscar", "Oscar"])
+        self.assertEqual(nan_safe_list(dc.df["solicitante_dni"]),
+                         [None] * 5)
 
     # @unittest.skip("skip")
     def test_string_peg_split(self):
@@ -460,6 +870,25 @@ class DataCleanerSingleMethodsTestCase(unittest.TestCase):
         self.assertEqual(res_2, exp_2)
         self.assertEqual(res_3, exp_3)
 
+    def test_string_peg_split_shared_grammar(self):
+        input_path = get_input("string_separable_complejo")
+        grammar = """
+            nombre = <(~',' anything)+>:n -> n.strip()
+            values = nombre:n ',' ws <anything+>:r -> [n, r]
+            """
+
+        dc = DataCleaner(input_path)
+        dc.string_peg_split("solicitante", grammar, ["apellido", "resto"])
+        misses = DataCleaner._compile_grammar.cache_info().misses
+        other_dc = DataCleaner(input_path)
+        parsed_df = other_dc.string_peg_split(
+            "solicitante", grammar, ["apellido", "resto"])
+
+        self.assertEqual(DataCleaner._compile_grammar.cache_info().misses,
+                         misses)
+        self.assertEqual(nan_safe_list(parsed_df["solicitante_apellido"]),
+                         ["Jorge", "Jorge", None, "Jorge", "Jorge"])
+
     def test_string_regex_substitute(self):
         input_path = get_input("regex_sub")
         output_path = get_output("regex_sub")
@@ -539,8 +968,54 @@ class NormalizarUnidadTerritorialTestCase(unittest.TestCase):
 
         input_path = get_input('normalize_unidad_territorial')
         dc = DataCleaner(input_path)
-        data = dc._build_data(field, entity, filters={})
+        data, codes = dc._build_data(field, entity, filters={})
         self.assertEqual(data, test_data)
+        self.assertEqual(list(codes), [0])
+
+    def test_build_data_distinct_queries(self):
+        """Construye una sola consulta por combinación de campos."""
+        dc = DataCleaner(get_input('normalize_unidad_territorial'))
+        dc.df = pd.DataFrame({
+            'nombre': ['laferrere', 'laferrere', None, 'laferrere'],
+            'provincia': ['buenos aires', 'buenos aires', 'salta', None]})
+
+        data, codes = dc._build_data('nombre', 'localidad',
+                                     filters={'provincia_field': 'provincia'})
+
+        self.assertEqual(data, {'localidades': [
+            {'nombre': 'laferrere', 'aplanar': True, 'max': 1,
+             'provincia': 'buenos aires'},
+            {'nombre': '0', 'aplanar': True, 'max': 1, 'provincia': 'salta'},
+            {'nombre': 'laferrere', 'aplanar': True, 'max': 1,
+             'provincia': '0'}
+        ]})
+        self.assertEqual(list(codes), [0, 0, 1, 2])
+
+    def test_normalizar_unidad_territorial(self):
+        """Asigna los resultados de cada consulta a todas sus filas."""
+        server = StubGeorefServer()
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        dc = DataCleaner(get_input('normalize_unidad_territorial'),
+                         georef=GeorefWrapper(url=server.url))
+        dc.df = pd.DataFrame({
+            'nombre': ['laferrere', 'inexistente', 'laferrere', 'salta'],
+            'provincia': ['buenos aires', 'x', 'buenos aires', None]},
+            index=[10, 3, 3, 7])
+
+        dc.normalizar_unidad_territorial(
+            'nombre', 'localidad', add_code=True,
+            filters={'provincia_field': 'provincia'})
+
+        self.assertEqual(list(dc.df.nombre),
+                         ['LAFERRERE', 'inexistente', 'LAFERRERE', 'SALTA'])
+        self.assertEqual(list(dc.df.localidad_id),
+                         ['id laferrere', None, 'id laferrere', 'id salta'])
+        self.assertEqual(len(server.requests[0]['localidades']), 3)
 
     @VCR.use_cassette()
     def test_get_api_response(self):
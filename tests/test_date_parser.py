@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""test_date_parser.py
+
+Tests for `date_parser.py` module.
+"""
+
+import unittest
+import nose
+import pandas as pd
+from dateutil import tz
+
+from data_cleaner.date_parser import compile_format, get_timezone
+from data_cleaner.date_parser import parse_datetime
+from data_cleaner.date_parser import parse_datetime_series, parse_date_series
+
+import sys
+sys.path.insert(0, '')
+
+TZINFO = tz.gettz("America/Argentina/Buenos Aires")
+
+
+class DateParserUnitTestCase(unittest.TestCase):
+    """Testea el funcionamiento de cada método del date parser."""
+
+    def test_compile_format(self):
+        """Testea qué formatos se pueden parsear de forma vectorizada."""
+        self.assertIsNotNone(compile_format("DD-MM-YYYY HH:mm"))
+        self.assertIsNotNone(compile_format("YYYYMMDD"))
+        self.assertIsNone(compile_format("DD [de] MMMM YYYY"))
+        self.assertIsNone(compile_format("DD-MM-YYYY hh:mm a"))
+
+    def test_parse_datetime_series(self):
+        """Testea que los resultados sean idénticos a los de arrow."""
+        series = pd.Series([
+            "11-03-2008 00:30",  # horario de verano
+            "01-01-1900 10:00",  # offset con segundos
+            "31-02-2016 10:00",  # fecha inválida
+            "12-11-2013 24:00",  # hora inválida
+            "x 12-11-2013 10:00",  # match no al principio
+            "12-11-2013 10:00 x",  # match parcial
+            None,
+        ], index=[5, 5, 6, 7, 8, 9, 10])
+        time_format = "DD-MM-YYYY HH:mm"
+        res = parse_datetime_series(series, time_format, TZINFO)
+
+        self.assertEqual(list(res.index), list(series.index))
+        self.assertEqual(list(res), [
+            parse_datetime(value, time_format, TZINFO) for value in series])
+        self.assertEqual(res.iloc[0], "2008-03-11T00:30:00-02:00")
+
+    def test_parse_datetime_series_default_timezone(self):
+        """Testea que la zona horaria por defecto se busque una sola vez."""
+        series = pd.Series(["12-11-2013 10:00"] * 3)
+        res = parse_datetime_series(series, "DD-MM-YYYY HH:mm")
+
+        self.assertIs(get_timezone(), get_timezone())
+        self.assertEqual(list(res), ["2013-11-12T10:00:00-03:00"] * 3)
+
+    def test_parse_datetime_series_old_years(self):
+        """Testea que los años lejanos a 1970 no pierdan precisión."""
+        series = pd.Series(["1722-08-11 15:51:53", "1823-12-31 23:59:59"])
+        time_format = "YYYY-MM-DD HH:mm:ss"
+        res = parse_datetime_series(series, time_format, TZINFO)
+
+        self.assertEqual(list(res), [
+            parse_datetime(value, time_format, TZINFO) for value in series])
+        self.assertTrue(res.iloc[0].startswith("1722-08-11T15:51:53"))
+
+    def test_parse_date_series(self):
+        """Testea que las fechas se trunquen según el formato."""
+        series = pd.Series(["12-2013", "1-2015", "13-2015", None])
+        res = parse_date_series(series, "M-YYYY", TZINFO)
+
+        self.assertEqual(list(res), ["2013-12", "2015-01", "", ""])
+
+
+if __name__ == '__main__':
+    nose.run(defaultTest=__name__)
@@ -8,11 +8,16 @@ Tests for `fingerprint_keyer.py` module.
 
 import unittest
 import nose
+import pandas as pd
 
 from data_cleaner.fingerprint_keyer import fingerprint_keyer
+from data_cleaner.fingerprint_keyer import fingerprint_keyer_series
 from data_cleaner.fingerprint_keyer import group_fingerprint_strings
+from data_cleaner.fingerprint_keyer import update_fingerprint_groups
+from data_cleaner.fingerprint_keyer import merge_fingerprint_groups
 from data_cleaner.fingerprint_keyer import get_best_replacements
 from data_cleaner.fingerprint_keyer import replace_by_key
+from data_cleaner.fingerprint_keyer import replace_by_key_series
 
 import sys
 sys.path.insert(0, '')
@@ -36,6 +41,22 @@ class FingerprintKeyerIntegrationTestCase(unittest.TestCase):
 
         self.assertEqual(clean_strings, exp_strings)
 
+    def test_fingerprint_series_methods_together(self):
+        """Testea los métodos de fingerprint que operan sobre series."""
+        inp_strings = pd.Series(["Geriátrico Sol", "Sol Geriatrico",
+                                 "Sol Geriatrico", None, "Otro"],
+                                index=[10, 11, 12, 13, 14])
+
+        keys = fingerprint_keyer_series(inp_strings, sort_tokens=True)
+        clusters, counts = group_fingerprint_strings(inp_strings, keys=keys)
+        replacements = get_best_replacements(clusters, counts)
+        clean_strings = replace_by_key_series(replacements, inp_strings,
+                                              keys=keys)
+
+        self.assertEqual(list(clean_strings.index), list(inp_strings.index))
+        self.assertEqual(list(clean_strings.fillna("")),
+                         ["Sol Geriatrico"] * 3 + ["", "Otro"])
+
 
 class FingerprintKeyerUnitTestCase(unittest.TestCase):
     """Testea el funcionamiento de cada método del fingerprint keyer."""
@@ -60,6 +81,19 @@ class FingerprintKeyerUnitTestCase(unittest.TestCase):
             self.assertEqual(fingerprint_keyer(inp_string, True, True),
                              out_exp)
 
+    def test_fingerprint_keyer_series(self):
+        """Testea que los fingerprints de una serie coincidan uno a uno."""
+        inp_strings = ["schön", "\tABC \t DEF ", "bbb\taaa", "müller", "",
+                       "bbb\taaa", "Juan ; Perés", 1.5, None]
+        keys = fingerprint_keyer_series(pd.Series(inp_strings), True, True)
+
+        for inp_string, key in zip(inp_strings, keys):
+            if inp_string is None:
+                self.assertTrue(pd.isnull(key))
+            else:
+                self.assertEqual(key, fingerprint_keyer(inp_string, True,
+                                                        True))
+
     def test_fingerprint_keyer_without_sorting(self):
         """Testea la creación de una key fingerprint sin ordenar los tokens."""
         input_output_strings = [
@@ -98,7 +132,6 @@ class FingerprintKeyerUnitTestCase(unittest.TestCase):
                                        'Juan -- Peres',
                                        'ju\xe1n Peres',
                                        'Juan Peres',
-                                       'Juan Peres',
                                        '   Juan\t \tPeres']}
         exp_counts = {'   Juan\t \tPeres': 1,
                       ' - juan     peRes': 1,
@@ -113,6 +146,48 @@ class FingerprintKeyerUnitTestCase(unittest.TestCase):
         self.assertEqual(clusters, exp_clusters)
         self.assertEqual(counts, exp_counts)
 
+    def test_update_fingerprint_groups(self):
+        """Testea la acumulación de clusters de a bloques de strings."""
+        input_strings = [
+            "Juan -- Peres",
+            "Juan Per\tes",
+            "Juan Peres",
+            "juán Peres",
+            "Juan Peres",
+            "Juan -- Peres",
+            "Juan Peres",
+        ]
+        exp_clusters = {'juan per es': ['Juan Per\tes'],
+                        'juan peres': ['Juan -- Peres',
+                                       'Juan Peres',
+                                       'ju\xe1n Peres']}
+        exp_counts = {'Juan -- Peres': 2,
+                      'Juan Per\tes': 1,
+                      'Juan Peres': 3,
+                      'ju\xe1n Peres': 1}
+        clusters, counts = {}, {}
+        for start in range(0, len(input_strings), 3):
+            update_fingerprint_groups(clusters, counts,
+                                      input_strings[start:start + 3])
+
+        self.assertEqual(clusters, exp_clusters)
+        self.assertEqual(counts, exp_counts)
+
+    def test_merge_fingerprint_groups(self):
+        """Testea que combinar clusters de lotes equivalga a agruparlos."""
+        input_strings = ["Juan -- Peres", "Juan Peres", "juán Peres",
+                         "Juan Peres", "Juan Per\tes", "Juan -- Peres"]
+        exp_clusters, exp_counts = group_fingerprint_strings(input_strings)
+
+        clusters, counts = {}, {}
+        for start in range(0, len(input_strings), 2):
+            merge_fingerprint_groups(clusters, counts,
+                                     *group_fingerprint_strings(
+                                         input_strings[start:start + 2]))
+
+        self.assertEqual(clusters, exp_clusters)
+        self.assertEqual(counts, exp_counts)
+
     def test_get_best_replacements(self):
         """Testea la toma de los mejores strings de cada cluster."""
         clusters = {'es juan per': ['Juan Per\tes'],
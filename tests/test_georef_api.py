@@ -0,0 +1,250 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""test_georef_api.py
+
+Tests for `georef_api.py` module.
+"""
+
+import unittest
+import nose
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import requests
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+from data_cleaner.georef_api import GeorefWrapper
+from data_cleaner.georef_cache import GeorefCache
+
+import sys
+sys.path.insert(0, '')
+
+
+def stub_result(entity, name):
+    """Resultado de la API local para un nombre."""
+    if name.startswith("inexistente"):
+        return {entity: []}
+    return {entity: [{"nombre": name.upper(), "id": "id " + name}]}
+
+
+class StubGeorefServer(ThreadingMixIn, HTTPServer):
+    """API de Georef local que devuelve los nombres en mayúsculas."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        HTTPServer.__init__(self, ("127.0.0.1", 0), StubGeorefHandler)
+        self.lock = threading.Lock()
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+        # cantidad de requests que responden 503 antes de responder bien
+        self.failures = 0
+        self.delay = 0
+        # código de las respuestas sin JSON, o None para responder JSON
+        self.html_status = None
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:{}/georef/api/".format(self.server_port)
+
+
+class StubGeorefHandler(BaseHTTPRequestHandler):
+
+    def do_POST(self):
+        server = self.server
+        entity = self.path.split("/")[-1]
+        body = json.loads(self.rfile.read(
+            int(self.headers["Content-Length"])).decode("utf-8"))
+
+        with server.lock:
+            server.requests.append(body)
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+            fail = server.failures > 0
+            server.failures -= 1
+        time.sleep(server.delay)
+        with server.lock:
+            server.active -= 1
+
+        if server.html_status:
+            self._respond_html(server.html_status)
+        elif fail:
+            self._respond(503, {"errores": [{"mensaje": "no disponible"}]})
+        elif any(not query.get("nombre") for query in body[entity]):
+            self._respond(400, {"errores": [
+                {} if query.get("nombre") else {"mensaje": "nombre vacío"}
+                for query in body[entity]]})
+        else:
+            self._respond(200, {"resultados": [
+                stub_result(entity, query["nombre"])
+                for query in body[entity]]})
+
+    def _respond(self, status, content):
+        content = json.dumps(content).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def _respond_html(self, status):
+        content = b"<html><body>Not Found</body></html>"
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubGeorefTestCase(unittest.TestCase):
+    """Levanta una API de Georef local para cada test."""
+
+    def setUp(self):
+        self.server = StubGeorefServer()
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def _data(self, names):
+        return {"localidades": [{"nombre": name, "max": 1, "aplanar": True}
+                                for name in names]}
+
+
+class GeorefWrapperTestCase(StubGeorefTestCase):
+    """Testea los requests bulk contra una API de Georef local."""
+
+    def test_concurrent_slices(self):
+        """Los bloques se envían en simultáneo y se unen en orden."""
+        self.server.delay = 0.1
+        wrapper = GeorefWrapper(url=self.server.url, max_bulk_len=2,
+                                max_workers=3)
+        names = ["localidad {}".format(i) for i in range(9)]
+
+        res = wrapper.search_locality(self._data(names))
+
+        self.assertEqual(res, [stub_result("localidades", name)
+                               for name in names])
+        self.assertEqual(len(self.server.requests), 5)
+        self.assertGreater(self.server.max_active, 1)
+        self.assertLessEqual(self.server.max_active, 3)
+
+    def test_retry(self):
+        """Los bloques se reintentan ante errores del servidor."""
+        self.server.failures = 2
+        wrapper = GeorefWrapper(url=self.server.url, backoff_factor=0)
+
+        res = wrapper.search_locality(self._data(["laferrere"]))
+
+        self.assertEqual(res, [stub_result("localidades", "laferrere")])
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_error(self):
+        """Devuelve el primer error de la API."""
+        wrapper = GeorefWrapper(url=self.server.url)
+
+        res = wrapper.search_locality(self._data(["laferrere", ""]))
+
+        self.assertEqual(res, {"error": {"mensaje": "nombre vacío"}})
+
+    def test_http_error_without_json(self):
+        """Las respuestas de error sin JSON levantan un HTTPError."""
+        self.server.html_status = 404
+        wrapper = GeorefWrapper(url=self.server.url)
+
+        with self.assertRaises(requests.HTTPError):
+            wrapper.search_locality(self._data(["laferrere"]))
+
+
+class GeorefCacheTestCase(StubGeorefTestCase):
+    """Testea el cache de resultados de Georef."""
+
+    def setUp(self):
+        super(GeorefCacheTestCase, self).setUp()
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        self.cache_path = os.path.join(cache_dir, "georef.sqlite")
+
+    def _sent_names(self):
+        return [query["nombre"] for body in self.server.requests
+                for query in body["localidades"]]
+
+    def test_cached_queries(self):
+        """Sólo se envían las consultas distintas que no están en cache."""
+        wrapper = GeorefWrapper(url=self.server.url,
+                                cache=GeorefCache(self.cache_path))
+        wrapper.search_locality(self._data(["a", "b", "a"]))
+
+        # el cache persiste entre objetos
+        cache = GeorefCache(self.cache_path)
+        wrapper = GeorefWrapper(url=self.server.url, cache=cache)
+        res = wrapper.search_locality(self._data(["a", "c", "c"]))
+
+        self.assertEqual(res, [stub_result("localidades", name)
+                               for name in ["a", "c", "c"]])
+        self.assertEqual(self._sent_names(), ["a", "b", "c"])
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+        self.assertAlmostEqual(cache.hit_rate, 1.0 / 3)
+
+    def test_filters_in_key(self):
+        """Las consultas con distintos filtros no comparten resultados."""
+        cache = GeorefCache(self.cache_path)
+        data = self._data(["a", "a"])
+        data["localidades"][1]["provincia"] = "salta"
+
+        GeorefWrapper(url=self.server.url, cache=cache).search_locality(data)
+
+        self.assertEqual(self._sent_names(), ["a", "a"])
+
+    def test_ttl(self):
+        """Los resultados vencidos se vuelven a consultar."""
+        cache = GeorefCache(self.cache_path, ttl=-1)
+        wrapper = GeorefWrapper(url=self.server.url, cache=cache)
+        wrapper.search_locality(self._data(["a"]))
+        wrapper.search_locality(self._data(["a"]))
+
+        self.assertEqual(self._sent_names(), ["a", "a"])
+
+    def test_expire_on_open(self):
+        """Los resultados vencidos se eliminan al abrir la base."""
+        GeorefCache(self.cache_path).set_many({"a": {"localidades": []}})
+        cache = GeorefCache(self.cache_path, ttl=-1)
+
+        rows = cache._connect().execute(
+            "SELECT COUNT(*) FROM resultados").fetchone()
+        self.assertEqual(rows[0], 0)
+
+    def test_lru_eviction(self):
+        """Se eliminan los resultados usados hace más tiempo."""
+        cache = GeorefCache(self.cache_path, max_entries=2)
+        wrapper = GeorefWrapper(url=self.server.url, cache=cache)
+        for names in [["a"], ["b"], ["a"], ["c"], ["a", "b"]]:
+            wrapper.search_locality(self._data(names))
+
+        self.assertEqual(self._sent_names(), ["a", "b", "c", "b"])
+
+    def test_error_not_cached(self):
+        """Los errores de la API no se guardan en el cache."""
+        wrapper = GeorefWrapper(url=self.server.url,
+                                cache=GeorefCache(self.cache_path))
+
+        res = wrapper.search_locality(self._data(["a", ""]))
+
+        self.assertIn("error", res)
+        self.assertEqual(wrapper.cache.get_many(
+            [GeorefCache.key("localidades", self._data(["a"])[
+                "localidades"][0])]), {})
+
+
+if __name__ == '__main__':
+    nose.run(defaultTest=__name__)
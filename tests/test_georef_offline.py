@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""test_georef_offline.py
+
+Tests for `georef_offline.py` module.
+"""
+
+import os
+import unittest
+import nose
+import pandas as pd
+
+from data_cleaner import DataCleaner
+from data_cleaner.georef_offline import GeorefOffline, flatten_record
+
+import sys
+sys.path.insert(0, '')
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+GAZETTEER = os.path.join(BASE_DIR, "input", "georef_gazetteer.json")
+
+
+class GeorefOfflineTestCase(unittest.TestCase):
+    """Testea las búsquedas sobre un nomenclador local."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.georef = GeorefOffline(GAZETTEER)
+
+    def _search(self, **query):
+        query.update({"max": 1, "aplanar": True})
+        res = self.georef.search_locality({"localidades": [query]})
+        return [record["id"] for record in res[0]["localidades"]]
+
+    def test_flatten_record(self):
+        """Aplana las unidades como la API."""
+        self.assertEqual(
+            flatten_record({"id": "1", "centroide": {"lat": 2, "lon": 3}}),
+            {"id": "1", "centroide_lat": 2, "centroide_lon": 3})
+
+    def test_search(self):
+        """Busca por nombre normalizado y por fingerprint."""
+        self.assertEqual(self._search(nombre="GREGORIO DE LAFERRÉRE"),
+                         ["06427010004"])
+        self.assertEqual(self._search(nombre="Laferrere, Gregorio de"),
+                         ["06427010004"])
+        self.assertEqual(self._search(nombre="Laferrere"), [])
+
+    def test_no_http_session(self):
+        """No crea la sesión HTTP de la API."""
+        self._search(nombre="laferrere")
+
+        self.assertIsNone(self.georef._session)
+
+    def test_search_filters(self):
+        """Los filtros aceptan nombres o ids de las unidades padre."""
+        self.assertEqual(self._search(nombre="san justo", provincia="salta"),
+                         ["66105020000"])
+        self.assertEqual(self._search(nombre="san justo", provincia="06"),
+                         ["06427010009"])
+        self.assertEqual(self._search(nombre="san justo",
+                                      departamento="general san martin"),
+                         ["66105020000"])
+        self.assertEqual(self._search(nombre="san justo", provincia="0"), [])
+
+    def test_result_shape(self):
+        """Devuelve las unidades aplanadas, con el formato de la API."""
+        res = self.georef.search_province(
+            {"provincias": [{"nombre": "salta", "max": 1, "aplanar": True},
+                            {"nombre": "x", "max": 1, "aplanar": True}]})
+
+        self.assertEqual(res, [
+            {"provincias": [{"id": "66", "nombre": "Salta",
+                             "centroide_lat": -24.299,
+                             "centroide_lon": -64.814}]},
+            {"provincias": []}])
+
+    def test_normalizar_unidad_territorial(self):
+        """Normaliza unidades territoriales sin conexión."""
+        dc = DataCleaner(os.path.join(
+            BASE_DIR, "input", "to_clean_normalize_unidad_territorial.csv"),
+            georef=self.georef)
+        dc.df = pd.DataFrame({"nombre": ["San Justo", "san justo"],
+                              "provincia": ["Buenos Aires", "Salta"]})
+
+        dc.normalizar_unidad_territorial(
+            "nombre", "localidad", add_code=True, add_centroid=True,
+            add_parents=["provincia", "municipio"],
+            filters={"provincia_field": "provincia"})
+
+        self.assertEqual(list(dc.df.localidad_id),
+                         ["06427010009", "66105020000"])
+        self.assertEqual(list(dc.df.municipio_nombre),
+                         ["La Matanza", "Tartagal"])
+        self.assertEqual(list(dc.df.provincia_id), ["06", "66"])
+
+
+if __name__ == '__main__':
+    nose.run(defaultTest=__name__)
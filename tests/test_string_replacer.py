@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""test_string_replacer.py
+
+Tests for `string_replacer.py` module.
+"""
+
+import unittest
+import nose
+import pandas as pd
+
+from data_cleaner.string_replacer import compile_replacements
+from data_cleaner.string_replacer import replace_substrings
+
+import sys
+sys.path.insert(0, '')
+
+
+class StringReplacerUnitTestCase(unittest.TestCase):
+    """Testea el funcionamiento de cada método del string replacer."""
+
+    def test_compile_replacements(self):
+        """Testea los reemplazos de un diccionario compilado."""
+        replace = compile_replacements({"Jaguarete": ["ABBA", "ABBBA"],
+                                        "Yacare": ["AB"]})
+        test_strings = [
+            ("Presidencia ABBA", "Presidencia Jaguarete"),
+            ("La ABBBA nación", "La Jaguarete nación"),
+            ("ABABBA", "YacareJaguarete"),
+            ("Sin cambios", "Sin cambios"),
+        ]
+        for (inp, outp) in test_strings:
+            self.assertEqual(replace(inp), outp)
+
+    def test_compile_replacements_cache(self):
+        """Testea que un mismo diccionario se compile una sola vez."""
+        replace = compile_replacements({"Servicios": ["Serv"]})
+
+        self.assertIs(compile_replacements({"Servicios": ["Serv"]}), replace)
+
+    def test_replace_substrings(self):
+        """Testea los reemplazos sobre una serie con valores nulos."""
+        series = pd.Series(["Serv de venta", None, 1, "Serv de venta"],
+                           index=[3, 4, 5, 6])
+        res = replace_substrings(series, {"Servicios": ["Serv"]})
+
+        self.assertEqual(list(res.index), [3, 4, 5, 6])
+        self.assertEqual([i if pd.notnull(i) else None for i in res],
+                         ["Servicios de venta", None, "1",
+                          "Servicios de venta"])
+
+
+if __name__ == '__main__':
+    nose.run(defaultTest=__name__)